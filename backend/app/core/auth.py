@@ -1,5 +1,9 @@
+from functools import lru_cache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.revocation import revocations
 from app.core.security import decode_access_token
 from app.models.user import UserResponseModel
 from app.db.connection import mongodb
@@ -7,18 +11,38 @@ from app.models.pyobjectid import PyObjectId
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Users keyed by the token's "sub"; invalidated when a user is updated or deleted
+@lru_cache(maxsize=None)
+def principal_cache() -> TTLCache:
+    return TTLCache(
+        maxsize=settings.USER_CACHE_MAX_ENTRIES,
+        ttl=settings.USER_CACHE_TTL_SECONDS,
+    )
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserResponseModel:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
     )
     payload = decode_access_token(token)
-    if payload is None:
+    if payload is None or payload.get("typ") == "refresh":
         raise credentials_exception
     user_id: str = payload.get("sub")
     if user_id is None:
         raise credentials_exception
+    if revocations.is_revoked(user_id, payload.get("ver", 0)):
+        raise credentials_exception
+    if settings.JWT_EMBED_ROLES and "roles" in payload:
+        # Roles signed into the token: authorize without loading the user
+        return UserResponseModel.model_construct(
+            id=PyObjectId(user_id), email=payload.get("email"), roles=payload["roles"]
+        )
+    cached_user = principal_cache().get(user_id)
+    if cached_user is not None:
+        return cached_user
     user = await mongodb.db["users"].find_one({"_id": PyObjectId(user_id)})
     if user is None:
         raise credentials_exception
-    return UserResponseModel(**user)
+    current_user = UserResponseModel(**user)
+    principal_cache().set(user_id, current_user)
+    return current_user
@@ -1,35 +1,194 @@
 # app/core/config.py
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from pydantic import Field, HttpUrl
+from pydantic import Field, HttpUrl, field_validator
+from typing import Literal
 
 class Settings(BaseSettings):
     APP_NAME: str = Field(default="ToDo List Application")
     DEBUG: bool = Field(default=False)
     VERSION: str = Field(default="1.0.0")
+    # Serialize rows read from Mongo without validating them a second time
+    FAST_JSON_RESPONSES: bool = Field(default=True)
+    # Prometheus metrics at /metrics; DEBUG also adds a Server-Timing header
+    METRICS_ENABLED: bool = Field(default=True)
+
+    # Server Settings (python -m app.server)
+    SERVER_HOST: str = Field(default="0.0.0.0")
+    SERVER_PORT: int = Field(default=8000)
+    SERVER_WORKERS: int = Field(default=1)
+    SERVER_LOOP: Literal["auto", "asyncio", "uvloop"] = Field(default="uvloop")
+    SERVER_HTTP: Literal["auto", "h11", "httptools"] = Field(default="httptools")
+    # On SIGTERM /readyz fails at once; the listener closes after DRAIN seconds,
+    # then in-flight requests get up to GRACEFUL_TIMEOUT seconds to finish
+    SHUTDOWN_DRAIN_SECONDS: float = Field(default=5)
+    SHUTDOWN_GRACEFUL_TIMEOUT_SECONDS: int = Field(default=30)
+    READINESS_PING_TIMEOUT_SECONDS: float = Field(default=1)
+    # Proxies whose X-Forwarded-For is trusted for the client IP (rate limits)
+    SERVER_FORWARDED_ALLOW_IPS: str = Field(default="127.0.0.1")
 
     # Database Settings
     MONGODB_URI: str = Field(..., env="MONGODB_URI")
     DATABASE_NAME: str = Field(default="projectDB")
+    # Set when MONGODB_URI points at mongos with app/models/sharding.py applied
+    MONGODB_SHARDED: bool = Field(default=False)
+
+    # Connection Pool Settings (passed to AsyncIOMotorClient)
+    MONGODB_MAX_POOL_SIZE: int = Field(default=100)
+    MONGODB_MIN_POOL_SIZE: int = Field(default=0)
+    MONGODB_MAX_IDLE_TIME_MS: int = Field(default=300000)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = Field(default=2000)
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = Field(default=5000)
+    MONGODB_CONNECT_TIMEOUT_MS: int = Field(default=5000)
+    MONGODB_SOCKET_TIMEOUT_MS: int = Field(default=10000)
+    # Comma separated, e.g. "zstd,snappy,zlib" (zstd/snappy need extra packages)
+    MONGODB_COMPRESSORS: str = Field(default="")
+    # Read preference for read-only endpoints (get_tasks, get_task, get_activities)
+    MONGODB_READ_PREFERENCE: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = Field(default="primary")
+    # Bounded staleness for secondary reads; -1 means no bound, otherwise >= 90
+    MONGODB_MAX_STALENESS_SECONDS: int = Field(default=-1)
 
     # Security Settings
     JWT_SECRET_KEY: str = Field(..., env="JWT_SECRET_KEY")
     JWT_ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30)
+    # PEM keys for RS256/ES256; verifier-only nodes set just the public key
+    JWT_PRIVATE_KEY_PATH: str = Field(default="")
+    JWT_PUBLIC_KEY_PATH: str = Field(default="")
+    JWT_KEY_ID: str = Field(default="default")
+    # Sign roles and email into access tokens so authorization skips the user lookup
+    JWT_EMBED_ROLES: bool = Field(default=False)
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = Field(default=10080)
+    TOKEN_REVOCATION_POLL_SECONDS: int = Field(default=5)
+    # Verified tokens skip jose.jwt.decode until they expire
+    TOKEN_CACHE_MAX_ENTRIES: int = Field(default=10000)
+
+    # Task Settings (tasks embed only their latest comments)
+    TASK_LATEST_COMMENTS: int = Field(default=5)
+    TASK_BULK_MAX_ITEMS: int = Field(default=1000)
+    # Largest page of GET /tasks/{id}/comments and /tasks/{id}/history
+    TASK_PAGE_MAX_LIMIT: int = Field(default=100)
+    # Keep per-activity task counters up to date on every task write
+    ACTIVITY_PROGRESS_COUNTERS: bool = Field(default=False)
+
+    # Import Settings (POST /tasks/import)
+    TASK_IMPORT_CHUNK_SIZE: int = Field(default=1000)
+    TASK_IMPORT_MAX_ERRORS: int = Field(default=100)
+    # Larger uploads run as a background job polled via GET /tasks/import/{job_id}
+    TASK_IMPORT_SYNC_MAX_BYTES: int = Field(default=5 * 1024 * 1024)
+
+    # Export Settings (cursor batch size for /tasks/export and /activities/export)
+    EXPORT_BATCH_SIZE: int = Field(default=1000)
+
+    # Stream Settings (/tasks/stream)
+    STREAM_CLIENT_BUFFER: int = Field(default=100)
+    STREAM_REPLAY_EVENTS: int = Field(default=1000)
+    STREAM_HEARTBEAT_SECONDS: int = Field(default=15)
+    # MongoDB 6.0+ with changeStreamPreAndPostImages on tasks/activities:
+    # reassigned and deleted tasks also reach their previous owners
+    STREAM_PRE_IMAGES: bool = Field(default=False)
+
+    # HTTP Cache Settings. COLLECTION_VERSIONS costs one extra write per task or
+    # activity mutation and enables list ETags and the response cache
+    COLLECTION_VERSIONS: bool = Field(default=False)
+    # "" (off), "memory" or a name passed to app.core.http_cache.register_backend
+    RESPONSE_CACHE_BACKEND: str = Field(default="")
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(default=30)
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=10000)
+
+    # Audit Settings (task/activity history, written in batches off the request path)
+    AUDIT_ENABLED: bool = Field(default=True)
+    AUDIT_QUEUE_SIZE: int = Field(default=10000)
+    AUDIT_BATCH_SIZE: int = Field(default=500)
+    AUDIT_FLUSH_SECONDS: float = Field(default=1.0)
+    # TTL index on the audit collection; changing it needs collMod on existing deployments
+    AUDIT_RETENTION_DAYS: int = Field(default=90)
+
+    # Cache Settings (authenticated users are cached per token subject)
+    USER_CACHE_TTL_SECONDS: int = Field(default=60)
+    USER_CACHE_MAX_ENTRIES: int = Field(default=10000)
+
+    # Rate Limit Settings: token buckets as "<requests>/<seconds>", "" for no limit,
+    # per client IP and per token subject for each route group (auth, write, read)
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    # "memory" (per worker) or a name passed to app.core.rate_limit.register_backend
+    RATE_LIMIT_BACKEND: str = Field(default="memory")
+    RATE_LIMIT_MAX_KEYS: int = Field(default=100000)
+    RATE_LIMIT_AUTH_PER_IP: str = Field(default="10/60")
+    RATE_LIMIT_WRITE_PER_IP: str = Field(default="600/60")
+    RATE_LIMIT_WRITE_PER_USER: str = Field(default="300/60")
+    RATE_LIMIT_READ_PER_IP: str = Field(default="")
+    RATE_LIMIT_READ_PER_USER: str = Field(default="")
+
+    @field_validator(
+        "RATE_LIMIT_AUTH_PER_IP", "RATE_LIMIT_WRITE_PER_IP", "RATE_LIMIT_WRITE_PER_USER",
+        "RATE_LIMIT_READ_PER_IP", "RATE_LIMIT_READ_PER_USER",
+    )
+    @classmethod
+    def check_rate_limit(cls, value: str) -> str:
+        # Fail at startup rather than on every rate-limited request
+        if not value:
+            return value
+        requests, _, seconds = value.partition("/")
+        try:
+            valid = float(requests) > 0 and float(seconds) > 0
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ValueError(f'expected "<requests>/<seconds>", both above zero, got {value!r}')
+        return value
+
+    # Password Hashing Settings (bcrypt runs on a bounded worker pool)
+    HASH_POOL_SIZE: int = Field(default=4)
+    HASH_QUEUE_LIMIT: int = Field(default=64)
 
-    # Email Settings (if you plan to send emails)
-    EMAIL_HOST: str = Field(..., env="EMAIL_HOST")
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        # .env also holds the variables of the optional groups below
+        extra = "ignore"
+
+# Email Settings (optional; no endpoint sends email yet)
+class EmailSettings(BaseSettings):
+    EMAIL_HOST: str = Field(default="")
     EMAIL_PORT: int = Field(default=587)
-    EMAIL_USERNAME: str = Field(..., env="EMAIL_USERNAME")
-    EMAIL_PASSWORD: str = Field(..., env="EMAIL_PASSWORD")
-    EMAIL_FROM: str = Field(..., env="EMAIL_FROM")
+    EMAIL_USERNAME: str = Field(default="")
+    EMAIL_PASSWORD: str = Field(default="")
+    EMAIL_FROM: str = Field(default="")
     EMAIL_FROM_NAME: str = Field(default="ToDo App Support")
     EMAIL_TLS: bool = Field(default=True)
     EMAIL_SSL: bool = Field(default=False)
 
+    @property
+    def enabled(self) -> bool:
+        return bool(self.EMAIL_HOST and self.EMAIL_FROM)
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        extra = "ignore"
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    return Settings()
+
+@lru_cache(maxsize=None)
+def get_email_settings() -> EmailSettings:
+    return EmailSettings()
+
+class LazySettings:
+    """Reads the environment and .env on first attribute access, not at import."""
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name):
+        delattr(get_settings(), name)
 
-# Initialize the settings
-settings = Settings()
\ No newline at end of file
+settings = LazySettings()
@@ -0,0 +1,81 @@
+# app/core/export.py
+#
+# Streams a Motor cursor as NDJSON or CSV with constant memory: documents
+# are encoded as they arrive and flushed in ~64KB chunks, optionally through
+# an incremental gzip compressor.
+
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.core.responses import dumps
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CHUNK_SIZE = 64 * 1024
+
+def check_format(format: str) -> None:
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format, use one of: {', '.join(EXPORT_FORMATS)}")
+
+def _csv_value(value) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ";".join(str(_csv_value(item)) for item in value)
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+async def ndjson_chunks(cursor) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for doc in cursor:
+        buffer += dumps(doc)
+        buffer += b"\n"
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+async def csv_chunks(cursor, columns: List[str]) -> AsyncIterator[bytes]:
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(columns)
+    async for doc in cursor:
+        writer.writerow([_csv_value(doc.get(column)) for column in columns])
+        if text.tell() >= CHUNK_SIZE:
+            yield text.getvalue().encode()
+            text.seek(0)
+            text.truncate()
+    if text.tell():
+        yield text.getvalue().encode()
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_response(
+    cursor,
+    format: str,
+    filename: str,
+    columns: Optional[List[str]] = None,
+    gzip: bool = False,
+) -> StreamingResponse:
+    chunks = ndjson_chunks(cursor) if format == "ndjson" else csv_chunks(cursor, columns)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=EXPORT_FORMATS[format], headers=headers)
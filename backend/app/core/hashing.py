@@ -0,0 +1,78 @@
+# app/core/hashing.py
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.instrumentation import timed
+from app.core.metrics import histogram
+
+hash_duration = histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password",
+    labelnames=("operation",),
+)
+hash_queue_wait = histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a password hashing job waited for a worker",
+    labelnames=("operation",),
+)
+
+class PasswordHasher:
+    """Runs bcrypt work on a bounded thread pool so it never blocks the event loop."""
+
+    def __init__(self, pool_size: int, queue_limit: int):
+        self.pool_size = pool_size
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        # Reject instead of queueing without bound when a burst saturates the pool
+        if self.pending >= self.pool_size + self.queue_limit:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": "1"},
+            )
+        queued_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            hash_queue_wait.observe(started_at - queued_at, operation=operation)
+            try:
+                return func(*args)
+            finally:
+                hash_duration.observe(time.perf_counter() - started_at, operation=operation)
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            with timed("bcrypt"):
+                return await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+@lru_cache(maxsize=None)
+def password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        pool_size=settings.HASH_POOL_SIZE,
+        queue_limit=settings.HASH_QUEUE_LIMIT,
+    )
@@ -0,0 +1,102 @@
+# app/core/http_cache.py
+#
+# Conditional GET and response caching. Single documents get a strong ETag
+# from their updated_at; lists get one from the caller's collection version
+# (app/db/versions.py) and query string, and can also be served from a
+# shared response cache keyed the same way.
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+def make_etag(*parts) -> str:
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Weak comparison, as If-None-Match requires
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+class ResponseCacheBackend(ABC):
+    """Stores rendered responses as (body, headers). Subclass to share across workers."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Tuple[bytes, Dict[str, str]], ttl: float) -> None:
+        ...
+
+class MemoryResponseCache(ResponseCacheBackend):
+    def __init__(self):
+        self._cache = TTLCache(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl):
+        self._cache.set(key, value, ttl)
+
+# RESPONSE_CACHE_BACKEND name -> factory; register_backend() adds shared ones
+RESPONSE_CACHE_BACKENDS: Dict[str, Callable[[], ResponseCacheBackend]] = {
+    "memory": MemoryResponseCache,
+}
+_backend: Optional[ResponseCacheBackend] = None
+
+def register_backend(name: str, factory: Callable[[], ResponseCacheBackend]) -> None:
+    RESPONSE_CACHE_BACKENDS[name] = factory
+
+def response_cache() -> Optional[ResponseCacheBackend]:
+    global _backend
+    if _backend is None and settings.RESPONSE_CACHE_BACKEND:
+        _backend = RESPONSE_CACHE_BACKENDS[settings.RESPONSE_CACHE_BACKEND]()
+    return _backend
+
+def document_response(request: Request, etag: str, render: Callable[[], Response]) -> Response:
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = render()
+    response.headers["ETag"] = etag
+    return response
+
+async def list_response(
+    request: Request,
+    version: Optional[int],
+    scope: str,
+    render: Callable[[], Awaitable[Response]],
+) -> Response:
+    """ETag/304 and cache lookup for a list endpoint; version None disables both.
+
+    The version already changes on every relevant write, so entries never
+    need deleting: a write simply makes the old keys unreachable.
+    """
+    if version is None:
+        return await render()
+    key = f"{scope}:{request.url.path}?{sorted(request.query_params.multi_items())}:{version}"
+    etag = make_etag(key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    cache = response_cache()
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        body, headers = cached
+        return Response(content=body, media_type="application/json", headers=headers)
+    response = await render()
+    if response.status_code == 200:
+        response.headers["ETag"] = etag
+        if cache:
+            headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+            cache.set(key, (response.body, headers), settings.RESPONSE_CACHE_TTL_SECONDS)
+    return response
@@ -0,0 +1,128 @@
+# app/core/instrumentation.py
+#
+# Per-request latency breakdown: an ASGI timing middleware, a pymongo command
+# listener and timed() phases (JWT decode, bcrypt, pydantic), all attributed
+# to the matched route and exported through app.core.metrics.
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.metrics import histogram
+
+request_duration = histogram(
+    "http_request_duration_seconds",
+    "Request latency by route",
+    labelnames=("method", "route", "status"),
+)
+mongo_command_duration = histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by route and command",
+    labelnames=("route", "command", "outcome"),
+)
+phase_duration = histogram(
+    "app_phase_duration_seconds",
+    "Time spent in JWT decode, bcrypt and pydantic by route",
+    labelnames=("route", "phase"),
+)
+
+class RequestTiming:
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @property
+    def route(self) -> str:
+        # FastAPI stores the matched route in the scope once routing is done
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or "unmatched"
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        entries = [f"{phase};dur={seconds * 1e3:.2f}" for phase, seconds in self.phases.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1e3:.2f}")
+        return ", ".join(entries)
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+def current_route() -> str:
+    timing = _current.get()
+    return timing.route if timing is not None else "none"
+
+def record_phase(phase: str, seconds: float) -> None:
+    timing = _current.get()
+    phase_duration.observe(seconds, route=timing.route if timing else "none", phase=phase)
+    if timing is not None:
+        timing.add(phase, seconds)
+
+@contextmanager
+def timed(phase: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, time.perf_counter() - started)
+
+class TimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timing = RequestTiming(scope)
+        token = _current.set(timing)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timing.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - timing.started,
+                method=scope["method"],
+                route=timing.route,
+                status=str(status_code),
+            )
+            _current.reset(token)
+
+class MongoCommandListener(monitoring.CommandListener):
+    # Motor runs pymongo in executor threads with the caller's context copied,
+    # so the request's RequestTiming is visible here
+    def started(self, event):
+        pass
+
+    def _record(self, event, outcome: str):
+        seconds = event.duration_micros / 1e6
+        timing = _current.get()
+        mongo_command_duration.observe(
+            seconds,
+            route=timing.route if timing else "none",
+            command=event.command_name,
+            outcome=outcome,
+        )
+        if timing is not None:
+            timing.add("mongo", seconds)
+
+    def succeeded(self, event):
+        self._record(event, "success")
+
+    def failed(self, event):
+        self._record(event, "failure")
@@ -0,0 +1,55 @@
+# app/core/lifecycle.py
+#
+# Readiness and drain state for one worker. /readyz reports ready only after
+# warm-up and until a drain starts; the drain gives the load balancer time to
+# stop routing here while in-flight requests finish (see app/server.py).
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+class LifecycleState:
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self._drain_callbacks: List[Callable[[], Awaitable[None]]] = []
+
+    def on_drain(self, callback: Callable[[], Awaitable[None]]) -> None:
+        # e.g. closing long-lived streams, which would otherwise never finish
+        self._drain_callbacks.append(callback)
+
+    async def begin_drain(self) -> None:
+        if self.draining:
+            return
+        self.draining = True
+        logger.info("Draining: %d request(s) in flight", self.in_flight)
+        for callback in self._drain_callbacks:
+            await callback()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self.in_flight == 0
+
+state = LifecycleState()
+
+class InFlightMiddleware:
+    """Counts HTTP requests being served, for the drain on shutdown."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            state.in_flight -= 1
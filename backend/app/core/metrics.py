@@ -0,0 +1,120 @@
+# app/core/metrics.py
+
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> Dict[Tuple[str, ...], List[float]]:
+        with self._lock:
+            return {key: list(series) for key, series in self._series.items()}
+
+class Gauge:
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+class Counter(Gauge):
+    # Monotonic; only inc() is meant to be used
+    pass
+
+registry: List[object] = []
+
+def histogram(name: str, description: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+    metric = Histogram(name, description, labelnames, **kwargs)
+    registry.append(metric)
+    return metric
+
+def gauge(name: str, description: str, labelnames: Sequence[str] = ()) -> Gauge:
+    metric = Gauge(name, description, labelnames)
+    registry.append(metric)
+    return metric
+
+def counter(name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+    metric = Counter(name, description, labelnames)
+    registry.append(metric)
+    return metric
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def render_prometheus() -> str:
+    # Prometheus text exposition format (version 0.0.4)
+    lines = []
+    for metric in registry:
+        if isinstance(metric, Histogram):
+            kind = "histogram"
+        elif isinstance(metric, Counter):
+            kind = "counter"
+        else:
+            kind = "gauge"
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {kind}")
+        for key, value in sorted(metric.snapshot().items()):
+            if kind != "histogram":
+                lines.append(f"{metric.name}{_labels(metric.labelnames, key)} {value}")
+                continue
+            for bound, count in zip(metric.buckets, value):
+                le = _labels(metric.labelnames, key, [("le", repr(float(bound)))])
+                lines.append(f"{metric.name}_bucket{le} {count}")
+            le = _labels(metric.labelnames, key, [("le", "+Inf")])
+            lines.append(f"{metric.name}_bucket{le} {value[-1]}")
+            lines.append(f"{metric.name}_sum{_labels(metric.labelnames, key)} {value[-2]}")
+            lines.append(f"{metric.name}_count{_labels(metric.labelnames, key)} {value[-1]}")
+    return "\n".join(lines) + "\n"
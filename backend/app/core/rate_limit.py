@@ -0,0 +1,179 @@
+# app/core/rate_limit.py
+#
+# Token-bucket rate limiting in front of the routers. Every request takes a
+# token from a bucket per client IP and, when it carries a valid bearer
+# token, one per token subject, both scoped to its route group. Limits are
+# "<requests>/<seconds>" strings in Settings: a bucket holds <requests>
+# tokens and refills at <requests>/<seconds> per second.
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import counter
+from app.core.responses import dumps
+from app.core.security import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+# (method, path) of the endpoints that run bcrypt for anonymous callers
+AUTH_ROUTES = {("POST", "/auth/login"), ("POST", "/auth/refresh"), ("POST", "/users/register")}
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# Probes and scrapes are never limited
+EXEMPT_PATHS = {"/healthz", "/readyz", "/metrics"}
+# Route group -> (per IP setting, per subject setting)
+GROUP_LIMITS = {
+    "auth": ("RATE_LIMIT_AUTH_PER_IP", None),
+    "write": ("RATE_LIMIT_WRITE_PER_IP", "RATE_LIMIT_WRITE_PER_USER"),
+    "read": ("RATE_LIMIT_READ_PER_IP", "RATE_LIMIT_READ_PER_USER"),
+}
+
+rate_limited = counter("http_rate_limited_total", "Requests rejected by the rate limiter", ("group", "scope"))
+
+@lru_cache(maxsize=None)
+def parse_limit(limit: str) -> Optional[Tuple[float, float]]:
+    """(capacity, refill per second) for "<requests>/<seconds>", None for ""."""
+    if not limit:
+        return None
+    requests, seconds = limit.split("/")
+    return float(requests), float(requests) / float(seconds)
+
+def route_group(method: str, path: str) -> Optional[str]:
+    if path in EXEMPT_PATHS:
+        return None
+    if (method, path.rstrip("/")) in AUTH_ROUTES:
+        return "auth"
+    return "write" if method in WRITE_METHODS else "read"
+
+# (key, capacity, refill per second)
+Bucket = Tuple[str, float, float]
+
+class RateLimitBackend(ABC):
+    """Token bucket storage. Subclass with a shared store (e.g. Redis and a
+    Lua script) so the limits hold across workers and nodes."""
+
+    @abstractmethod
+    async def take(self, buckets: List[Bucket]) -> List[float]:
+        """Takes a token from every bucket, or from none of them.
+
+        Returns the seconds until each bucket has a token: all 0 when the
+        tokens were taken. A request rejected by one bucket (say per user)
+        must not spend the others (per IP).
+        """
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    # Per worker: with N workers each client effectively gets N times the limit
+    def __init__(self):
+        self._buckets = TTLCache(maxsize=settings.RATE_LIMIT_MAX_KEYS, ttl=0)
+
+    async def take(self, buckets):
+        now = time.monotonic()
+        levels = []
+        for key, capacity, refill_per_second in buckets:
+            bucket = self._buckets.get(key)
+            tokens = capacity
+            if bucket is not None:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+            levels.append(tokens)
+        waits = [
+            (1 - tokens) / refill_per_second if tokens < 1 else 0.0
+            for tokens, (_, _, refill_per_second) in zip(levels, buckets)
+        ]
+        if any(waits):
+            return waits
+        for tokens, (key, capacity, refill_per_second) in zip(levels, buckets):
+            tokens -= 1
+            # A bucket idle until it is full again is the same as no bucket
+            self._buckets.set(key, (tokens, now), ttl=(capacity - tokens) / refill_per_second)
+        return waits
+
+# RATE_LIMIT_BACKEND name -> factory; register_backend() adds shared ones
+RATE_LIMIT_BACKENDS: Dict[str, Callable[[], RateLimitBackend]] = {
+    "memory": MemoryRateLimitBackend,
+}
+_backend: Optional[RateLimitBackend] = None
+
+def register_backend(name: str, factory: Callable[[], RateLimitBackend]) -> None:
+    RATE_LIMIT_BACKENDS[name] = factory
+
+def rate_limit_backend() -> RateLimitBackend:
+    global _backend
+    if _backend is None:
+        _backend = RATE_LIMIT_BACKENDS[settings.RATE_LIMIT_BACKEND]()
+    return _backend
+
+def _token_subject(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            # Served from the verified-token cache after the first request
+            payload = decode_access_token(token)
+            return payload.get("sub") if payload else None
+    return None
+
+async def check_rate_limit(scope) -> Optional[float]:
+    """Seconds the client must wait, or None if the request may proceed."""
+    group = route_group(scope["method"], scope["path"])
+    if group is None:
+        return None
+    ip_setting, user_setting = GROUP_LIMITS[group]
+    checks = []
+    ip_limit = parse_limit(getattr(settings, ip_setting))
+    if ip_limit and scope.get("client"):
+        checks.append(("ip", scope["client"][0], ip_limit))
+    user_limit = parse_limit(getattr(settings, user_setting)) if user_setting else None
+    if user_limit:
+        subject = _token_subject(scope)
+        if subject is not None:
+            checks.append(("user", subject, user_limit))
+
+    if not checks:
+        return None
+
+    buckets = [
+        (f"{group}:{scope_name}:{identity}", capacity, refill)
+        for scope_name, identity, (capacity, refill) in checks
+    ]
+    try:
+        waits = await rate_limit_backend().take(buckets)
+    except Exception:
+        # Fail open: an unavailable shared store must not take the API down
+        logger.exception("Rate limit backend failed")
+        return None
+    if not any(waits):
+        return None
+    # Counted once, against the first bucket that was empty
+    scope_name = next(scope_name for (scope_name, _, _), wait in zip(checks, waits) if wait > 0)
+    rate_limited.inc(group=group, scope=scope_name)
+    return max(waits)
+
+class RateLimitMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        wait = await check_rate_limit(scope)
+        if wait is None:
+            await self.app(scope, receive, send)
+            return
+        body = dumps({"detail": "Too many requests, please retry later"})
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(wait)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
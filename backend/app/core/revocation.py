@@ -0,0 +1,101 @@
+# app/core/revocation.py
+#
+# Compact token revocation: one document per user holding the lowest token
+# version ("ver" claim) still accepted. Every worker mirrors the collection in
+# memory and polls it for changes, so checking a token never touches Mongo.
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOCATIONS_COLLECTION = "token_revocations"
+# Re-read a little before the last sync to tolerate clock skew between nodes
+SYNC_OVERLAP = timedelta(seconds=5)
+# Minimum version for deleted users: no token is accepted any more
+ALL_VERSIONS = 2**31 - 1
+
+def revocation_lifetime() -> timedelta:
+    # Once every token signed before the revocation has expired the entry is moot
+    return timedelta(minutes=max(settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.REFRESH_TOKEN_EXPIRE_MINUTES))
+
+class RevocationList:
+    def __init__(self):
+        # user id -> (lowest accepted version, entry expiry)
+        self.min_versions: Dict[str, Tuple[int, datetime]] = {}
+        self.synced_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, user_id: str, version: int) -> bool:
+        entry = self.min_versions.get(user_id)
+        return entry is not None and version < entry[0] and entry[1] > datetime.utcnow()
+
+    def _apply(self, doc: dict) -> None:
+        key = str(doc["_id"])
+        current = self.min_versions.get(key)
+        if current is None or doc["min_ver"] >= current[0]:
+            self.min_versions[key] = (doc["min_ver"], doc["expires_at"])
+
+    async def revoke(self, db, user_id: ObjectId, min_version: int) -> None:
+        now = datetime.utcnow()
+        expires_at = now + revocation_lifetime()
+        await db[REVOCATIONS_COLLECTION].update_one(
+            {"_id": user_id},
+            {"$max": {"min_ver": min_version}, "$set": {"updated_at": now, "expires_at": expires_at}},
+            upsert=True,
+        )
+        self._apply({"_id": user_id, "min_ver": min_version, "expires_at": expires_at})
+
+    async def sync(self, db) -> None:
+        started = datetime.utcnow()
+        query = {} if self.synced_at is None else {"updated_at": {"$gte": self.synced_at - SYNC_OVERLAP}}
+        async for doc in db[REVOCATIONS_COLLECTION].find(query, {"min_ver": 1, "expires_at": 1}):
+            self._apply(doc)
+        self.synced_at = started
+        # The TTL index removes expired documents; drop their local copies too
+        self.min_versions = {
+            key: entry for key, entry in self.min_versions.items() if entry[1] > started
+        }
+
+    async def _poll(self, db, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync(db)
+            except PyMongoError as exc:
+                logger.warning("Token revocation sync failed: %s", exc)
+
+    def start(self, db) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll(db, settings.TOKEN_REVOCATION_POLL_SECONDS))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+revocations = RevocationList()
+
+async def revoke_user_tokens(db, user_id: ObjectId) -> Optional[dict]:
+    """Bump the user's token_version so every token issued so far is rejected."""
+    user = await db["users"].find_one_and_update(
+        {"_id": user_id},
+        {"$inc": {"token_version": 1}},
+        projection={"token_version": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if user is not None:
+        await revocations.revoke(db, user_id, user["token_version"])
+    return user
@@ -0,0 +1,71 @@
+# app/core/search.py
+
+import re
+from typing import Dict, List, Optional
+
+# Tasks carry their own token index, kept up to date by the write paths:
+#   search_terms: edge n-grams of every word in title and description (indexed)
+#   search_title: whole words of the title (used to rank results)
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 20
+MAX_TERMS = 2000
+MAX_QUERY_TERMS = 8
+# Relevance sorting ranks only this many of the most recently updated matches
+MAX_RELEVANCE_CANDIDATES = 1000
+
+SEARCH_FIELDS_PROJECTION = {"search_terms": 0, "search_title": 0}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    words = []
+    for word in _WORD_RE.findall((text or "").lower()):
+        word = word[:MAX_TERM_LENGTH]
+        if len(word) >= MIN_TERM_LENGTH and word not in words:
+            words.append(word)
+    return words
+
+def edge_ngrams(word: str) -> List[str]:
+    return [word[:n] for n in range(MIN_TERM_LENGTH, len(word) + 1)]
+
+def search_fields(title: Optional[str], description: Optional[str]) -> Dict[str, List[str]]:
+    terms = set()
+    for word in tokenize(title) + tokenize(description):
+        terms.update(edge_ngrams(word))
+        if len(terms) >= MAX_TERMS:
+            break
+    return {
+        "search_terms": sorted(terms),
+        "search_title": tokenize(title),
+    }
+
+def query_terms(search: str) -> List[str]:
+    return tokenize(search)[:MAX_QUERY_TERMS]
+
+def relevance_pipeline(
+    query: dict,
+    terms: List[str],
+    skip: int,
+    limit: int,
+    projection: Optional[dict] = None,
+    candidates: int = MAX_RELEVANCE_CANDIDATES,
+) -> list:
+    # Every match contains all terms as word prefixes; whole-word hits in the
+    # title rank first, then the most recently updated tasks. A short common
+    # prefix can match most of the collection, so only the newest
+    # `candidates` matches are scored: $sort + $limit is a bounded top-k sort
+    # instead of a blocking sort of the whole match set
+    return [
+        {"$match": query},
+        {"$sort": {"updated_at": -1, "_id": -1}},
+        {"$limit": candidates},
+        {"$addFields": {"_score": {"$size": {"$filter": {
+            "input": "$search_title",
+            "cond": {"$in": ["$$this", terms]},
+        }}}}},
+        {"$sort": {"_score": -1, "updated_at": -1, "_id": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$project": projection} if projection
+        else {"$unset": [*SEARCH_FIELDS_PROJECTION, "_score"]},
+    ]
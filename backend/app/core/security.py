@@ -1,43 +1,121 @@
 # app/core/security.py
 
+import hashlib
+import time
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from typing import Union, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Union, Dict, Any, Optional, Tuple
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.instrumentation import timed
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/bcrypt and python-jose/cryptography are imported on first use
+# (see preload_crypto), not when the app is imported
+@lru_cache(maxsize=None)
+def password_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def preload_crypto() -> None:
+    import jose.jwk, jose.jwt
+    password_context()
+
+# Verified payloads keyed by sha256 of the token, each kept until its own exp
+@lru_cache(maxsize=None)
+def token_cache() -> TTLCache:
+    return TTLCache(maxsize=settings.TOKEN_CACHE_MAX_ENTRIES, ttl=0)
+
+def _is_asymmetric(algorithm: str) -> bool:
+    return algorithm[:2] in ("RS", "ES", "PS")
+
+@lru_cache(maxsize=None)
+def signing_keys() -> Tuple[Optional[str], str]:
+    """(signing key, verification key) for JWT_ALGORITHM.
+
+    HS* use JWT_SECRET_KEY for both. RS*/ES*/PS* read PEM files; a node that
+    only verifies tokens needs JWT_PUBLIC_KEY_PATH and no private key.
+    """
+    if not _is_asymmetric(settings.JWT_ALGORITHM):
+        return settings.JWT_SECRET_KEY, settings.JWT_SECRET_KEY
+    private_key = None
+    if settings.JWT_PRIVATE_KEY_PATH:
+        private_key = Path(settings.JWT_PRIVATE_KEY_PATH).read_text()
+    if not settings.JWT_PUBLIC_KEY_PATH:
+        raise RuntimeError(f"JWT_PUBLIC_KEY_PATH is required for {settings.JWT_ALGORITHM}")
+    return private_key, Path(settings.JWT_PUBLIC_KEY_PATH).read_text()
+
+def public_jwks() -> Dict[str, Any]:
+    # Empty for HS* so the shared secret is never published
+    if not _is_asymmetric(settings.JWT_ALGORITHM):
+        return {"keys": []}
+    from jose import jwk
+    key = jwk.construct(signing_keys()[1], settings.JWT_ALGORITHM).to_dict()
+    key.update({"use": "sig", "kid": settings.JWT_KEY_ID})
+    return {"keys": [key]}
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher().run("verify", verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher().run("hash", get_password_hash, password)
 
 def create_access_token(
     subject: Union[str, int],
-    expires_delta: timedelta = None
+    expires_delta: timedelta = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
+    private_key = signing_keys()[0]
+    if private_key is None:
+        raise RuntimeError("JWT_PRIVATE_KEY_PATH is not set; this node can only verify tokens")
+    from jose import jwt
+    headers = {"kid": settings.JWT_KEY_ID} if _is_asymmetric(settings.JWT_ALGORITHM) else None
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
+        private_key,
+        algorithm=settings.JWT_ALGORITHM,
+        headers=headers,
     )
     return encoded_jwt
 
+def create_refresh_token(subject: Union[str, int], version: int) -> str:
+    return create_access_token(
+        subject,
+        expires_delta=timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+        claims={"typ": "refresh", "ver": version},
+    )
+
 def decode_access_token(token: str) -> Union[Dict[str, Any], None]:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache().get(cache_key)
+    if payload is not None:
+        # Re-check exp against the wall clock; the cache TTL runs on the monotonic clock
+        if payload["exp"] > time.time():
+            return dict(payload)
+        token_cache().invalidate(cache_key)
+    from jose import JWTError, jwt
     try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        return payload
+        with timed("jwt_decode"):
+            payload = jwt.decode(
+                token,
+                signing_keys()[1],
+                algorithms=[settings.JWT_ALGORITHM]
+            )
     except JWTError:
         return None
+    if isinstance(payload.get("exp"), (int, float)):
+        token_cache().set(cache_key, payload, ttl=payload["exp"] - time.time())
+    return dict(payload)
@@ -1,10 +1,69 @@
 # app/core/utils.py
 
+import base64
+from datetime import datetime
+from bson import json_util
 from bson.objectid import ObjectId
-from typing import Any
+from typing import Any, Dict, Iterable, List, Optional, Type
+from pydantic import BaseModel, ValidationError
 
 def is_valid_object_id(id_str: str) -> bool:
     return ObjectId.is_valid(id_str)
 
 def get_object_id(id_str: str) -> ObjectId:
     return ObjectId(id_str)
+
+# Types a sort value in a cursor may have (bool is an int)
+CURSOR_VALUE_TYPES = (type(None), str, int, float, datetime, ObjectId)
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    raw = json_util.dumps(data, json_options=json_util.CANONICAL_JSON_OPTIONS)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    # Raises ValueError for anything that is not a cursor we issued
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    # "v" and "id" go straight into keyset filters: a forged cursor must not
+    # smuggle in operator documents, arrays or regexes
+    if not isinstance(data.get("id"), ObjectId) or not isinstance(data.get("v", ...), CURSOR_VALUE_TYPES):
+        raise ValueError("Invalid cursor")
+    return data
+
+def parse_fields(
+    fields: Optional[str],
+    view: str,
+    allowed: Iterable[str],
+    default: Iterable[str],
+) -> Optional[List[str]]:
+    # Fields to project for ?fields=/?view=summary, or None for the full document
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in allowed]
+        if not names or unknown:
+            raise ValueError("Unknown fields: " + ", ".join(unknown))
+        return names
+    if view == "summary":
+        return list(default)
+    if view != "full":
+        raise ValueError("Invalid view")
+    return None
+
+def dump_summary(model: Type[BaseModel], docs: List[dict], fields: List[str]) -> List[dict]:
+    include = {"id", *fields}
+    return [
+        model(**doc).model_dump(mode="json", by_alias=True, include=include)
+        for doc in docs
+    ]
+
+def validation_detail(exc: ValidationError) -> str:
+    # One line per failing field, for per-item error reports
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
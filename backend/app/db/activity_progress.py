@@ -0,0 +1,86 @@
+# app/db/activity_progress.py
+#
+# Activity progress (task counts by status and priority), either aggregated
+# on demand with one $lookup or read from a counter document per activity
+# that the task write paths keep up to date (ACTIVITY_PROGRESS_COUNTERS).
+
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from app.models.task import TASK_SUMMARY_FIELDS
+
+PROGRESS_COLLECTION = "activity_progress"
+
+def progress_from_tasks(tasks: Iterable[dict]) -> dict:
+    progress = {"total": 0, "by_status": {}, "by_priority": {}}
+    for task in tasks:
+        progress["total"] += 1
+        for field, key in (("by_status", "status"), ("by_priority", "priority")):
+            value = task.get(key)
+            if value is not None:
+                progress[field][value] = progress[field].get(value, 0) + 1
+    return progress
+
+def expand_pipeline(match: dict) -> list:
+    # One round-trip: the activity, its tasks (summary fields) and nothing else
+    return [
+        {"$match": match},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "tasks",
+            "localField": "tasks",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {field: 1 for field in TASK_SUMMARY_FIELDS}}],
+            "as": "task_items",
+        }},
+    ]
+
+async def rebuild_progress(db, activity: dict) -> dict:
+    cursor = db["tasks"].find(
+        {"_id": {"$in": activity.get("tasks") or []}},
+        {"status": 1, "priority": 1},
+    )
+    progress = progress_from_tasks(await cursor.to_list(length=None))
+    await db[PROGRESS_COLLECTION].replace_one(
+        {"_id": activity["_id"]},
+        {"manager_id": activity["manager_id"], **progress},
+        upsert=True,
+    )
+    return progress
+
+def _counter_delta(before: dict, after: Optional[dict]) -> dict:
+    delta = defaultdict(int)
+    if after is None:
+        delta["total"] -= 1
+    for field, key in (("by_status", "status"), ("by_priority", "priority")):
+        old = before.get(key)
+        new = after.get(key) if after is not None else None
+        if old == new:
+            continue
+        if old is not None:
+            delta[f"{field}.{old}"] -= 1
+        if new is not None:
+            delta[f"{field}.{new}"] += 1
+    return {key: value for key, value in delta.items() if value}
+
+async def apply_task_changes(db, changes: List[Tuple[dict, Optional[dict]]]) -> None:
+    # changes: (task before, task after or None when deleted)
+    deltas = {}
+    for before, after in changes:
+        delta = _counter_delta(before, after)
+        if delta:
+            deltas[before["_id"]] = delta
+    if not deltas:
+        return
+    cursor = db["activities"].find({"tasks": {"$in": list(deltas)}}, {"tasks": 1})
+    totals = defaultdict(lambda: defaultdict(int))
+    async for activity in cursor:
+        for task_id in activity.get("tasks") or []:
+            for key, value in deltas.get(task_id, {}).items():
+                totals[activity["_id"]][key] += value
+    requests = [
+        UpdateOne({"_id": activity_id}, {"$inc": dict(delta)})
+        for activity_id, delta in totals.items()
+    ]
+    if requests:
+        await db[PROGRESS_COLLECTION].bulk_write(requests, ordered=False)
@@ -0,0 +1,144 @@
+# app/db/audit.py
+#
+# Audit trail for task and activity writes. Handlers only put an event on a
+# bounded in-process queue; a background consumer writes the queue to the
+# audit collection in batches with insert_many. Events carry their own _id,
+# so a batch retried after a cancelled write cannot be stored twice.
+
+import asyncio
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.core.config import settings
+from app.core.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLLECTION = "audit"
+# Bookkeeping fields that change on every write and say nothing about it
+UNAUDITED_FIELDS = {
+    "_id", "created_at", "updated_at", "search_terms", "search_title",
+    "comments", "comment_count",
+}
+
+audit_events = counter("audit_events_total", "Audit events by outcome", ("outcome",))
+
+def diff(before: Optional[dict], after: Optional[dict], fields: Optional[Iterable[str]] = None) -> dict:
+    """{field: {"from": old, "to": new}} for every audited field that changed."""
+    before, after = before or {}, after or {}
+    if fields is None:
+        fields = before.keys() | after.keys()
+    return {
+        field: {"from": before.get(field), "to": after.get(field)}
+        for field in sorted(set(fields) - UNAUDITED_FIELDS)
+        if before.get(field) != after.get(field)
+    }
+
+def audit_event(
+    collection: str,
+    action: str,
+    entity_id,
+    actor,
+    changes: Optional[dict] = None,
+    owner_ids: Iterable = (),
+) -> dict:
+    # owners (see app.db.versions.owners) authorize history reads once the
+    # entity itself is deleted
+    return {
+        "_id": ObjectId(),
+        "collection": collection,
+        "entity_id": entity_id,
+        "action": action,
+        "actor": actor,
+        "at": datetime.utcnow(),
+        "changes": changes or {},
+        "owners": list(owner_ids),
+    }
+
+class AuditLog:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # The batch being written, kept so stop() can retry it
+        self._batch: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def emit(self, *events: dict) -> None:
+        # Never blocks the request; a full queue drops (and counts) the event
+        if not settings.AUDIT_ENABLED:
+            return
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                audit_events.inc(outcome="dropped")
+                logger.warning("Audit queue full, dropped %s %s", event["action"], event["entity_id"])
+
+    async def write(self, db, batch: List[dict]) -> None:
+        # Also used directly by callers that already write in batches (task import)
+        try:
+            await db[AUDIT_COLLECTION].insert_many(batch, ordered=False)
+        except BulkWriteError as exc:
+            # Duplicate _ids are events a cancelled write already stored
+            failed = [error for error in exc.details.get("writeErrors", []) if error.get("code") != 11000]
+            if failed:
+                audit_events.inc(len(failed), outcome="failed")
+                logger.warning("Audit write lost %d event(s): %s", len(failed), failed[0].get("errmsg"))
+            audit_events.inc(len(batch) - len(failed), outcome="written")
+            return
+        except PyMongoError as exc:
+            audit_events.inc(len(batch), outcome="failed")
+            logger.warning("Audit write lost %d event(s): %s", len(batch), exc)
+            return
+        audit_events.inc(len(batch), outcome="written")
+
+    def _take(self, limit: int) -> None:
+        while len(self._batch) < limit and not self.queue.empty():
+            self._batch.append(self.queue.get_nowait())
+
+    async def _consume(self, db) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self.queue.get())
+            # Wait up to AUDIT_FLUSH_SECONDS for a fuller batch
+            deadline = loop.time() + settings.AUDIT_FLUSH_SECONDS
+            while len(self._batch) < settings.AUDIT_BATCH_SIZE:
+                self._take(settings.AUDIT_BATCH_SIZE)
+                remaining = deadline - loop.time()
+                if len(self._batch) >= settings.AUDIT_BATCH_SIZE or remaining <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self.write(db, self._batch)
+            self._batch = []
+
+    async def flush(self, db) -> None:
+        """Writes everything queued so far; used on shutdown."""
+        while self._batch or not self.queue.empty():
+            self._take(settings.AUDIT_BATCH_SIZE)
+            await self.write(db, self._batch)
+            self._batch = []
+
+    def start(self, db) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._consume(db))
+
+    async def stop(self, db) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(db)
+
+@lru_cache(maxsize=None)
+def audit_log() -> AuditLog:
+    return AuditLog(settings.AUDIT_QUEUE_SIZE)
@@ -0,0 +1,190 @@
+# app/db/change_feed.py
+#
+# One change stream per worker on tasks + activities, fanned out to the
+# /tasks/stream subscribers. Each subscriber has a bounded queue; when a
+# client falls behind it is dropped and reconnects with its last event id,
+# which is replayed from a small ring buffer of recent events.
+
+import asyncio
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Optional, Set, Tuple
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.core.search import SEARCH_FIELDS_PROJECTION
+
+logger = logging.getLogger(__name__)
+
+WATCHED_COLLECTIONS = ("tasks", "activities")
+# Who may see a change, per collection (admins see everything)
+AUDIENCE_FIELDS = {
+    "tasks": ("assigned_to", "created_by"),
+    "activities": ("manager_id",),
+}
+WATCH_PIPELINE = [
+    {"$match": {
+        "ns.coll": {"$in": list(WATCHED_COLLECTIONS)},
+        "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+    }},
+]
+RETRY_SECONDS = 1.0
+# The resume token points at oplog entries that are gone (CappedPositionLost,
+# InvalidResumeToken, ChangeStreamHistoryLost, ChangeStreamFatalError)
+NON_RESUMABLE_CODES = {136, 260, 280, 286}
+
+def feed_event(change: dict) -> Tuple[dict, Optional[frozenset]]:
+    """Client-facing event for a change plus the ids allowed to see it.
+
+    The audience comes from the document after the change and, when the
+    collection has pre-images enabled, the one before it, so a reassigned
+    task reaches both users. A delete without a pre-image has no owner
+    information, so its audience is None and only admins receive it.
+    """
+    collection = change["ns"]["coll"]
+    after = change.get("fullDocument")
+    before = change.get("fullDocumentBeforeChange")
+    audience = set()
+    for doc in (after, before):
+        for field in AUDIENCE_FIELDS[collection] if doc else ():
+            if doc.get(field) is not None:
+                audience.add(doc[field])
+    document = None
+    if after is not None:
+        document = {key: value for key, value in after.items() if key not in SEARCH_FIELDS_PROJECTION}
+    event = {
+        "id": change["_id"]["_data"],
+        "collection": collection,
+        "op": change["operationType"],
+        "document_id": change["documentKey"]["_id"],
+        "document": document,
+    }
+    if "updateDescription" in change:
+        event["fields"] = sorted(change["updateDescription"].get("updatedFields", {}))
+    if change["operationType"] == "delete" and before is None:
+        return event, None
+    return event, frozenset(audience)
+
+class Subscriber:
+    def __init__(self, current_user, maxsize: int):
+        self.user_id = current_user.id
+        self.is_admin = "admin" in current_user.roles
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def wants(self, audience: Optional[frozenset]) -> bool:
+        # Without an audience the owners are unknown; other tenants must not
+        # learn the id, so only admins get it (STREAM_PRE_IMAGES reaches owners)
+        if self.is_admin:
+            return True
+        return audience is not None and self.user_id in audience
+
+class ChangeFeed:
+    def __init__(self, buffer_size: int, replay_size: int):
+        self.buffer_size = buffer_size
+        self.subscribers: Set[Subscriber] = set()
+        self.replay: Deque[Tuple[dict, Optional[frozenset]]] = deque(maxlen=replay_size)
+        self.resume_token: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, db, current_user, last_event_id: Optional[str] = None) -> Tuple[Subscriber, bool]:
+        """Register a subscriber and queue the events it missed.
+
+        Returns (subscriber, resumed). resumed is False when last_event_id is
+        no longer in the replay buffer; the client should then re-read
+        GET /tasks/ instead of trusting the stream to be complete.
+        """
+        subscriber = Subscriber(current_user, self.buffer_size)
+        self.subscribers.add(subscriber)
+        resumed = last_event_id is None
+        if last_event_id is not None:
+            events = list(self.replay)
+            ids = [event["id"] for event, _ in events]
+            if last_event_id in ids:
+                resumed = True
+                for event, audience in events[ids.index(last_event_id) + 1:]:
+                    if subscriber.wants(audience):
+                        self._offer(subscriber, event)
+        self.start(db)
+        return subscriber, resumed
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def _offer(self, subscriber: Subscriber, event: dict) -> None:
+        try:
+            subscriber.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop it rather than buffer without bound
+            subscriber.dropped = True
+            self._close(subscriber)
+
+    def _close(self, subscriber: Subscriber) -> None:
+        # None tells the endpoint to close the connection
+        self.subscribers.discard(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def publish(self, change: dict) -> None:
+        event, audience = feed_event(change)
+        self.replay.append((event, audience))
+        for subscriber in list(self.subscribers):
+            if subscriber.wants(audience):
+                self._offer(subscriber, event)
+
+    async def run(self, db) -> None:
+        while True:
+            try:
+                options = {"full_document": "updateLookup", "resume_after": self.resume_token}
+                if settings.STREAM_PRE_IMAGES:
+                    options["full_document_before_change"] = "whenAvailable"
+                async with db.watch(WATCH_PIPELINE, **options) as stream:
+                    async for change in stream:
+                        self.resume_token = change["_id"]
+                        self.publish(change)
+            except OperationFailure as exc:
+                if exc.code not in NON_RESUMABLE_CODES:
+                    logger.warning("Task change stream interrupted: %s", exc)
+                else:
+                    logger.warning("Task change stream lost its position, restarting from now: %s", exc)
+                    self._restart()
+                await asyncio.sleep(RETRY_SECONDS)
+            except PyMongoError as exc:
+                # Change streams need a replica set; keep retrying from the last token
+                logger.warning("Task change stream interrupted: %s", exc)
+                await asyncio.sleep(RETRY_SECONDS)
+
+    def _restart(self) -> None:
+        # Changes since the token are lost. Subscribers are dropped and the
+        # replay buffer emptied, so a reconnect with the last id gets a
+        # reset and re-reads GET /tasks/
+        self.resume_token = None
+        self.replay.clear()
+        for subscriber in list(self.subscribers):
+            subscriber.dropped = True
+            self._close(subscriber)
+
+    def start(self, db) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(db))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscriber in list(self.subscribers):
+            self._close(subscriber)
+
+@lru_cache(maxsize=None)
+def task_feed() -> ChangeFeed:
+    return ChangeFeed(
+        buffer_size=settings.STREAM_CLIENT_BUFFER,
+        replay_size=settings.STREAM_REPLAY_EVENTS,
+    )
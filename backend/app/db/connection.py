@@ -1,19 +1,150 @@
 # app/db/connection.py
 
+import asyncio
+import logging
+import threading
+import time
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.read_preferences import Nearest, PrimaryPreferred, Secondary, SecondaryPreferred
 from app.core.config import settings
+from app.core.metrics import counter, gauge, histogram
+from app.core.instrumentation import MongoCommandListener
+
+logger = logging.getLogger(__name__)
 
 class MongoDB:
     client: AsyncIOMotorClient = None
     db = None
+    # Same database with the configured read preference; None means primary
+    secondary_db = None
+
+    @property
+    def read_db(self):
+        # For read-only endpoints that can tolerate bounded staleness
+        return self.secondary_db if self.secondary_db is not None else self.db
+
+    @property
+    def list_db(self):
+        # List pages are ETagged and cached under a version read from the
+        # primary, so with COLLECTION_VERSIONS they must be read there too:
+        # a lagging secondary would store old rows under the new version
+        return self.db if settings.COLLECTION_VERSIONS else self.read_db
 
 mongodb = MongoDB()
 
+READ_PREFERENCES = {
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+pool_connections = gauge("mongodb_pool_connections", "Open connections per server", ("address",))
+pool_checked_out = gauge("mongodb_pool_checked_out", "Connections in use per server", ("address",))
+pool_wait_queue = gauge("mongodb_pool_wait_queue", "Operations waiting for a connection", ("address",))
+pool_checkout_failures = counter(
+    "mongodb_pool_checkout_failures_total", "Failed connection checkouts", ("address", "reason")
+)
+pool_wait = histogram("mongodb_pool_wait_seconds", "Time spent waiting for a connection", ("address",))
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    # Check-out start and end fire on the same thread, so wait time is
+    # measured with a thread-local start timestamp
+    _local = threading.local()
+
+    def _address(self, event) -> str:
+        return "%s:%s" % event.address
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+
+    def connection_created(self, event):
+        pool_connections.inc(address=self._address(event))
+
+    def connection_closed(self, event):
+        pool_connections.dec(address=self._address(event))
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        pool_wait_queue.inc(address=self._address(event))
+
+    def connection_check_out_failed(self, event):
+        address = self._address(event)
+        pool_wait_queue.dec(address=address)
+        pool_checkout_failures.inc(address=address, reason=event.reason)
+
+    def connection_checked_out(self, event):
+        address = self._address(event)
+        pool_wait_queue.dec(address=address)
+        pool_checked_out.inc(address=address)
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            pool_wait.observe(time.perf_counter() - started, address=address)
+
+    def connection_checked_in(self, event):
+        pool_checked_out.dec(address=self._address(event))
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "event_listeners": [PoolStatsListener(), MongoCommandListener()],
+    }
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return options
+
+def pool_snapshot() -> dict:
+    metrics = {
+        "connections": pool_connections,
+        "checked_out": pool_checked_out,
+        "wait_queue": pool_wait_queue,
+    }
+    stats = {}
+    for name, metric in metrics.items():
+        for (address,), value in metric.snapshot().items():
+            stats.setdefault(address, {})[name] = value
+    for (address, reason), value in pool_checkout_failures.snapshot().items():
+        stats.setdefault(address, {}).setdefault("checkout_failures", {})[reason] = value
+    return stats
+
 async def connect_to_mongo():
-    mongodb.client = AsyncIOMotorClient(settings.MONGODB_URI)
+    mongodb.client = AsyncIOMotorClient(settings.MONGODB_URI, **client_options())
     mongodb.db = mongodb.client[settings.DATABASE_NAME]
-    print("Connected to MongoDB")
+    read_preference = READ_PREFERENCES.get(settings.MONGODB_READ_PREFERENCE)
+    if read_preference is not None:
+        mongodb.secondary_db = mongodb.client.get_database(
+            settings.DATABASE_NAME,
+            read_preference=read_preference(max_staleness=settings.MONGODB_MAX_STALENESS_SECONDS),
+        )
+    logger.info("Connected to MongoDB")
+
+async def warm_up_mongo():
+    # Round-trips before taking traffic: server selection, auth and a few
+    # pooled connections on each database handle the routers read from
+    await mongodb.client.admin.command("ping")
+    await asyncio.gather(*(
+        db[collection].find_one({}, {"_id": 1})
+        for db in {id(mongodb.db): mongodb.db, id(mongodb.read_db): mongodb.read_db}.values()
+        for collection in ("users", "tasks", "activities")
+    ))
+
+async def ping_mongo(timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(mongodb.client.admin.command("ping"), timeout)
+        return True
+    except Exception:
+        return False
 
 async def close_mongo_connection():
     mongodb.client.close()
-    print("Closed connection to MongoDB")
+    logger.info("Closed connection to MongoDB")
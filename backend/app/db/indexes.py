@@ -0,0 +1,114 @@
+# app/db/indexes.py
+
+import asyncio
+import json
+import sys
+from datetime import datetime
+from bson import ObjectId
+from app.models.indexes import INDEXES, audit_ttl_index
+from app.models.task import TASK_SORT_FIELDS
+
+async def ensure_indexes(db):
+    # create_indexes is a no-op for indexes that already exist
+    for collection, indexes in INDEXES.items():
+        await db[collection].create_indexes(indexes)
+    await db["audit"].create_indexes([audit_ttl_index()])
+
+# Representative query shapes issued by the routers, with placeholder values
+_ID = ObjectId("000000000000000000000000")
+_OWNER_FILTER = {"$or": [{"assigned_to": _ID}, {"created_by": _ID}]}
+
+QUERY_SHAPES = [
+    {"name": "users.by_email", "collection": "users", "filter": {"email": "user@example.com"}},
+    {"name": "users.by_id", "collection": "users", "filter": {"_id": _ID}},
+    {"name": "tasks.by_id", "collection": "tasks", "filter": {"_id": _ID}},
+    {
+        "name": "comments.by_task",
+        "collection": "comments",
+        "filter": {"task_id": _ID},
+        "sort": {"timestamp": -1, "_id": -1},
+    },
+    {"name": "activities.by_id", "collection": "activities", "filter": {"_id": _ID}},
+    {"name": "activities.by_manager", "collection": "activities", "filter": {"manager_id": _ID}},
+    {
+        "name": "tasks.search",
+        "collection": "tasks",
+        "filter": {**_OWNER_FILTER, "search_terms": {"$all": ["weekly", "report"]}},
+    },
+    {
+        "name": "audit.by_entity",
+        "collection": "audit",
+        "filter": {"entity_id": _ID},
+        "sort": {"at": -1, "_id": -1},
+    },
+    {
+        "name": "token_revocations.since",
+        "collection": "token_revocations",
+        "filter": {"updated_at": {"$gte": datetime(2000, 1, 1)}},
+    },
+]
+for _field in TASK_SORT_FIELDS:
+    QUERY_SHAPES.append({
+        "name": f"tasks.list_by_{_field}",
+        "collection": "tasks",
+        "filter": _OWNER_FILTER,
+        "sort": {_field: 1, "_id": 1},
+    })
+    QUERY_SHAPES.append({
+        "name": f"tasks.list_all_by_{_field}",
+        "collection": "tasks",
+        "filter": {},
+        "sort": {_field: 1, "_id": 1},
+    })
+
+def plan_stages(plan) -> list:
+    # Walks any explain plan (including per-shard plans) and collects stage names
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(plan_stages(item))
+    return stages
+
+def coverage_entry(shape: dict, explain: dict) -> dict:
+    stages = plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    return {
+        "name": shape["name"],
+        "collection": shape["collection"],
+        "stages": stages,
+        "indexed": "COLLSCAN" not in stages,
+        "in_memory_sort": "SORT" in stages,
+    }
+
+async def index_coverage_report(db) -> list:
+    report = []
+    for shape in QUERY_SHAPES:
+        find = {"find": shape["collection"], "filter": shape["filter"]}
+        if "sort" in shape:
+            find["sort"] = shape["sort"]
+        explain = await db.command({"explain": find, "verbosity": "queryPlanner"})
+        report.append(coverage_entry(shape, explain))
+    return report
+
+async def _main() -> int:
+    from app.db.connection import connect_to_mongo, close_mongo_connection, mongodb
+
+    await connect_to_mongo()
+    try:
+        await ensure_indexes(mongodb.db)
+        report = await index_coverage_report(mongodb.db)
+    finally:
+        await close_mongo_connection()
+    print(json.dumps(report, indent=2))
+    uncovered = [entry["name"] for entry in report if not entry["indexed"]]
+    if uncovered:
+        print("Query shapes without an index: " + ", ".join(uncovered), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
@@ -0,0 +1,81 @@
+# app/db/migrations.py
+#
+# One-off data migrations, run with: python -m app.db.migrations <name>
+
+import asyncio
+import sys
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.core.search import search_fields
+
+BATCH_SIZE = 1000
+
+async def backfill_task_search(db) -> int:
+    # Populate the token index for tasks written before search_terms existed
+    updated = 0
+    batch = []
+    cursor = db["tasks"].find(
+        {"search_terms": {"$exists": False}},
+        {"title": 1, "description": 1},
+    ).batch_size(BATCH_SIZE)
+    async for task in cursor:
+        batch.append(UpdateOne(
+            {"_id": task["_id"]},
+            {"$set": search_fields(task.get("title"), task.get("description"))},
+        ))
+        if len(batch) >= BATCH_SIZE:
+            updated += (await db["tasks"].bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await db["tasks"].bulk_write(batch, ordered=False)).modified_count
+    return updated
+
+async def migrate_embedded_comments(db) -> int:
+    # Copy embedded comments into the comments collection and keep only the
+    # latest ones on the task. Run before serving add_comment on old data, or
+    # its $slice would drop comments that were never copied.
+    migrated = 0
+    latest = settings.TASK_LATEST_COMMENTS
+    cursor = db["tasks"].find(
+        {"comment_count": {"$exists": False}},
+        {"comments": 1},
+    ).batch_size(BATCH_SIZE)
+    async for task in cursor:
+        comments = task.get("comments") or []
+        # Safe to re-run: anything stored for an unmigrated task comes from an
+        # earlier, interrupted run
+        await db["comments"].delete_many({"task_id": task["_id"]})
+        if comments:
+            await db["comments"].insert_many(
+                [{"task_id": task["_id"], **comment} for comment in comments]
+            )
+        await db["tasks"].update_one(
+            {"_id": task["_id"]},
+            {"$set": {
+                "comment_count": len(comments),
+                "comments": comments[-latest:] if latest > 0 else [],
+            }},
+        )
+        migrated += 1
+    return migrated
+
+MIGRATIONS = {
+    "task-search": backfill_task_search,
+    "task-comments": migrate_embedded_comments,
+}
+
+async def _main(name: str) -> None:
+    from app.db.connection import connect_to_mongo, close_mongo_connection, mongodb
+
+    await connect_to_mongo()
+    try:
+        count = await MIGRATIONS[name](mongodb.db)
+    finally:
+        await close_mongo_connection()
+    print(f"{name}: {count} documents migrated")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in MIGRATIONS:
+        print("usage: python -m app.db.migrations {" + ",".join(MIGRATIONS) + "}", file=sys.stderr)
+        sys.exit(2)
+    asyncio.run(_main(sys.argv[1]))
@@ -0,0 +1,69 @@
+# app/db/sharding.py
+#
+# Enables sharding for the database and shards the collections listed in
+# app/models/sharding.py. Safe to re-run. Usage against mongos:
+#   python -m app.db.sharding          # set up
+#   python -m app.db.sharding status   # chunks per shard
+
+import asyncio
+import json
+import sys
+from pymongo.errors import OperationFailure
+from app.models.sharding import SHARD_KEYS
+
+async def setup_sharding(client, database_name: str) -> dict:
+    admin = client.admin
+    try:
+        await admin.command("enableSharding", database_name)
+    except OperationFailure as exc:
+        # AlreadyInitialized on servers that do not treat this as a no-op
+        if exc.code != 23:
+            raise
+    db = client[database_name]
+    results = {}
+    for collection, key in SHARD_KEYS.items():
+        namespace = f"{database_name}.{collection}"
+        existing = await client["config"]["collections"].find_one({"_id": namespace})
+        if existing is not None:
+            if existing.get("key") != key:
+                raise RuntimeError(f"{namespace} is already sharded on {existing.get('key')}, not {key}")
+            results[collection] = "already sharded"
+            continue
+        # Non-empty collections need the shard key index before sharding
+        await db[collection].create_index(list(key.items()))
+        await admin.command("shardCollection", namespace, key=key)
+        results[collection] = "sharded"
+    return results
+
+async def shard_status(client, database_name: str) -> dict:
+    status = {}
+    for collection in SHARD_KEYS:
+        namespace = f"{database_name}.{collection}"
+        meta = await client["config"]["collections"].find_one({"_id": namespace})
+        if meta is None:
+            status[collection] = "not sharded"
+            continue
+        pipeline = [
+            {"$match": {"uuid": meta["uuid"]}},
+            {"$group": {"_id": "$shard", "chunks": {"$sum": 1}}},
+        ]
+        chunks = await client["config"]["chunks"].aggregate(pipeline).to_list(length=None)
+        status[collection] = {chunk["_id"]: chunk["chunks"] for chunk in chunks}
+    return status
+
+async def _main(command: str) -> None:
+    from app.core.config import settings
+    from app.db.connection import connect_to_mongo, close_mongo_connection, mongodb
+
+    await connect_to_mongo()
+    try:
+        if command == "status":
+            result = await shard_status(mongodb.client, settings.DATABASE_NAME)
+        else:
+            result = await setup_sharding(mongodb.client, settings.DATABASE_NAME)
+    finally:
+        await close_mongo_connection()
+    print(json.dumps(result, indent=2, default=str))
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1] if len(sys.argv) > 1 else "setup"))
@@ -0,0 +1,165 @@
+# app/db/task_import.py
+#
+# Streaming task import: rows are parsed from the uploaded file a chunk at a
+# time (in a worker thread, the file may be spooled to disk), validated with
+# TaskCreateModel and written with one insert_many per chunk. Progress is
+# kept in the import_jobs collection so large imports can run in the background.
+
+import asyncio
+import logging
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import BinaryIO, Callable, Iterator, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.utils import validation_detail
+from app.db.audit import audit_event, audit_log, diff
+from app.db.versions import bump_versions, owners
+from app.models.task import TaskCreateModel
+
+logger = logging.getLogger(__name__)
+
+IMPORT_JOBS_COLLECTION = "import_jobs"
+# Background imports still running in this worker (keeps the tasks referenced)
+running_imports = set()
+
+def detect_format(filename: Optional[str], format: Optional[str]) -> str:
+    if format:
+        return format
+    return "csv" if (filename or "").lower().endswith(".csv") else "ndjson"
+
+def parse_rows(stream: BinaryIO, format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yields (row number, row, error) without reading the whole file."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if format == "csv":
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=1):
+            # Empty cells mean "not set", e.g. no assigned_to
+            yield row_number, {key: value for key, value in row.items() if key and value != ""}, None
+        return
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield row_number, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Expected a JSON object"
+            continue
+        yield row_number, row, None
+
+async def new_import_job(db, user_id, filename: Optional[str], format: str) -> dict:
+    job = {
+        "user_id": user_id,
+        "status": "queued",
+        "filename": filename,
+        "format": format,
+        "total": 0,
+        "inserted": 0,
+        "failed": 0,
+        "errors": [],
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    job["_id"] = (await db[IMPORT_JOBS_COLLECTION].insert_one(job)).inserted_id
+    return job
+
+def _keep_errors(job: dict, errors: list) -> list:
+    # Only the first TASK_IMPORT_MAX_ERRORS errors of a job are kept
+    kept = errors[:max(settings.TASK_IMPORT_MAX_ERRORS - len(job["errors"]), 0)]
+    job["errors"].extend(kept)
+    return kept
+
+async def run_import(db, job: dict, stream: BinaryIO, build_document: Callable[[TaskCreateModel], dict]) -> dict:
+    """Imports every row of stream and returns the finished job document."""
+    jobs = db[IMPORT_JOBS_COLLECTION]
+    job.update(status="running")
+    await jobs.update_one({"_id": job["_id"]}, {"$set": {"status": "running"}})
+    rows = parse_rows(stream, job["format"])
+    final_errors = []
+    try:
+        while True:
+            chunk = await run_in_threadpool(lambda: list(islice(rows, settings.TASK_IMPORT_CHUNK_SIZE)))
+            if not chunk:
+                break
+            docs, row_numbers, errors = [], [], []
+            for row_number, row, error in chunk:
+                if error is None:
+                    try:
+                        docs.append(build_document(TaskCreateModel(**row)))
+                        row_numbers.append(row_number)
+                        continue
+                    except ValidationError as exc:
+                        error = validation_detail(exc)
+                errors.append({"row": row_number, "detail": error})
+            inserted = len(docs)
+            if docs:
+                failed = set()
+                try:
+                    await db["tasks"].insert_many(docs, ordered=False)
+                except BulkWriteError as exc:
+                    write_errors = exc.details.get("writeErrors", [])
+                    inserted -= len(write_errors)
+                    failed = {write_error["index"] for write_error in write_errors}
+                    errors.extend(
+                        {"row": row_numbers[write_error["index"]], "detail": write_error["errmsg"]}
+                        for write_error in write_errors
+                    )
+                await bump_versions(db, "tasks", owners("tasks", *docs))
+                if settings.AUDIT_ENABLED and inserted:
+                    # Already one write per chunk, so the chunk's events are
+                    # stored directly instead of flooding the audit queue
+                    await audit_log().write(db, [
+                        audit_event("tasks", "create", doc["_id"], job["user_id"], diff(None, doc), owners("tasks", doc))
+                        for index, doc in enumerate(docs) if index not in failed
+                    ])
+            kept = _keep_errors(job, errors)
+            job["total"] += len(chunk)
+            job["inserted"] += inserted
+            job["failed"] += len(chunk) - inserted
+            # One progress write per chunk
+            await jobs.update_one({"_id": job["_id"]}, {
+                "$inc": {"total": len(chunk), "inserted": inserted, "failed": len(chunk) - inserted},
+                "$push": {"errors": {"$each": kept}},
+            })
+        job["status"] = "completed"
+    except UnicodeDecodeError:
+        job["status"] = "failed"
+        final_errors = _keep_errors(job, [{"row": job["total"] + 1, "detail": "File is not valid UTF-8"}])
+    except asyncio.CancelledError:
+        # Worker shutdown cancels background imports; the job must not stay "running"
+        job["status"] = "failed"
+        final_errors = _keep_errors(job, [{"row": job["total"] + 1, "detail": "Import interrupted"}])
+        raise
+    except Exception:
+        job["status"] = "failed"
+        raise
+    finally:
+        job["finished_at"] = datetime.utcnow()
+        update = {"$set": {"status": job["status"], "finished_at": job["finished_at"]}}
+        if final_errors:
+            update["$push"] = {"errors": {"$each": final_errors}}
+        await jobs.update_one({"_id": job["_id"]}, update)
+    return job
+
+def start_background_import(db, job: dict, stream: BinaryIO, build_document) -> None:
+    async def run():
+        try:
+            await run_import(db, job, stream, build_document)
+        except Exception:
+            logger.exception("Task import %s failed", job["_id"])
+        finally:
+            stream.close()
+
+    task = asyncio.create_task(run())
+    running_imports.add(task)
+    task.add_done_callback(running_imports.discard)
@@ -0,0 +1,48 @@
+# app/db/versions.py
+#
+# Per-user collection versions: a counter per (collection, user) bumped by
+# every write that can change what that user's list endpoints return, plus
+# a "*" counter for admins who see everything. List ETags and the response
+# cache key are derived from it, so one point read replaces the list query
+# when nothing changed. Only maintained when COLLECTION_VERSIONS is on.
+
+from typing import Iterable, Optional
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+
+VERSIONS_COLLECTION = "collection_versions"
+ALL_USERS = "*"
+# Fields naming the users whose lists contain a document
+OWNER_FIELDS = {
+    "tasks": ("assigned_to", "created_by"),
+    "activities": ("manager_id",),
+}
+
+def owners(collection: str, *docs) -> set:
+    return {
+        doc[field]
+        for doc in docs if doc
+        for field in OWNER_FIELDS[collection]
+        if doc.get(field) is not None
+    }
+
+async def bump_versions(db, collection: str, user_ids: Iterable) -> None:
+    if not settings.COLLECTION_VERSIONS:
+        return
+    keys = sorted({f"{collection}:{user_id}" for user_id in user_ids} | {f"{collection}:{ALL_USERS}"})
+    await db[VERSIONS_COLLECTION].bulk_write(
+        [UpdateOne({"_id": key}, {"$inc": {"v": 1}}, upsert=True) for key in keys],
+        ordered=False,
+    )
+
+def version_scope(current_user) -> str:
+    return ALL_USERS if "admin" in current_user.roles else str(current_user.id)
+
+async def read_version(db, collection: str, current_user) -> Optional[int]:
+    # None when versions are off, which disables list ETags and caching
+    if not settings.COLLECTION_VERSIONS:
+        return None
+    doc = await db[VERSIONS_COLLECTION].find_one({"_id": f"{collection}:{version_scope(current_user)}"})
+    return doc["v"] if doc else 0
@@ -1,31 +1,101 @@
 # app/main.py
 
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
-from app.db.connection import connect_to_mongo, close_mongo_connection
+from app.db.connection import connect_to_mongo, close_mongo_connection, warm_up_mongo, mongodb
+from app.db.indexes import ensure_indexes
+from app.db.task_import import running_imports
+from app.db.audit import audit_log
+from app.core.hashing import password_hasher
+from app.core.lifecycle import InFlightMiddleware, state
+from app.core.revocation import revocations
+from app.core.security import preload_crypto, signing_keys
+from app.db.change_feed import task_feed
+from app.core.responses import MongoJSONResponse, trusted_rows
+from app.core.instrumentation import TimingMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.metrics import render_prometheus
+from app.models.activity import ActivityResponseModel, ActivitySummaryModel
+from app.models.task import TaskResponseModel, TaskSummaryModel
 
-from app.routers import user, task, activity, auth # Make sure 'user' is imported
+from app.routers import user, task, activity, auth, admin, stream, health # Make sure 'user' is imported
 
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.VERSION,
-    debug=settings.DEBUG
-)
+logger = logging.getLogger(__name__)
 
-@app.on_event("startup")
-async def startup_db_client():
-    await connect_to_mongo()
+async def warm_up():
+    # Everything the first requests would otherwise pay for
+    # Crypto imports run in a thread while the Mongo round trips are in flight
+    await asyncio.gather(warm_up_mongo(), run_in_threadpool(preload_crypto))
+    signing_keys()
+    for model in (TaskResponseModel, TaskSummaryModel, ActivityResponseModel, ActivitySummaryModel):
+        trusted_rows(model, [])
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_to_mongo()
+    await ensure_indexes(mongodb.db)
+    await revocations.sync(mongodb.db)
+    revocations.start(mongodb.db)
+    audit_log().start(mongodb.db)
+    # Streams never finish on their own; close them as soon as draining starts
+    state.on_drain(task_feed().stop)
+    await warm_up()
+    state.ready = True
+    logger.info("Worker ready")
+    yield
+    await state.begin_drain()
+    if not await state.wait_idle(settings.SHUTDOWN_GRACEFUL_TIMEOUT_SECONDS):
+        logger.warning("Shutting down with %d request(s) in flight", state.in_flight)
+    imports = list(running_imports)
+    for job in imports:
+        job.cancel()
+    # Lets each job record itself as failed before the connection closes
+    await asyncio.gather(*imports, return_exceptions=True)
+    await revocations.stop()
+    # Writes whatever handlers queued before the drain finished
+    await audit_log().stop(mongodb.db)
+    await task_feed().stop()
     await close_mongo_connection()
+    password_hasher().shutdown()
 
+class TodoApp(FastAPI):
+    def build_middleware_stack(self):
+        # Runs on the first ASGI message (lifespan startup), so settings are
+        # not read when app.main is imported
+        self.title = settings.APP_NAME
+        self.version = settings.VERSION
+        self.debug = settings.DEBUG
+        return super().build_middleware_stack()
 
+app = TodoApp(
+    default_response_class=MongoJSONResponse,
+    lifespan=lifespan,
+)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(TimingMiddleware)
+app.add_middleware(InFlightMiddleware)
+
+
+app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(user.router)
+app.include_router(stream.router)
 app.include_router(task.router)
 app.include_router(activity.router)
+app.include_router(admin.router)
 
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "Welcome to the ToDo List Application"}
+
+@app.get("/metrics", tags=["Root"], include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -1,9 +1,10 @@
 # app/models/activity.py
 
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.models.pyobjectid import PyObjectId
+from app.models.task import TaskSummaryModel
 from bson import ObjectId
 
 class ActivityCreateModel(BaseModel):
@@ -30,3 +31,41 @@ class ActivityResponseModel(BaseModel):
         arbitrary_types_allowed=True,
         json_encoders={PyObjectId: str},
     )
+
+# Slim list schema for GET /activities?view=summary or ?fields=...
+class ActivitySummaryModel(BaseModel):
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
+    activity_name: Optional[str] = None
+    description: Optional[str] = None
+    task_count: Optional[int] = None
+    manager_id: Optional[PyObjectId] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
+
+ACTIVITY_SUMMARY_FIELDS = ["activity_name", "task_count", "updated_at"]
+
+# CSV export columns; task ids are joined with ";"
+ACTIVITY_EXPORT_COLUMNS = [
+    "_id", "activity_name", "description", "manager_id", "tasks", "created_at", "updated_at",
+]
+
+# Computed fields a summary projection can ask Mongo for
+ACTIVITY_COMPUTED_FIELDS = {
+    "task_count": {"$size": {"$ifNull": ["$tasks", []]}},
+}
+
+class ActivityProgressModel(BaseModel):
+    total: int = 0
+    by_status: Dict[str, int] = Field(default_factory=dict)
+    by_priority: Dict[str, int] = Field(default_factory=dict)
+
+# GET /activities/{id}?expand=tasks
+class ActivityDetailModel(ActivityResponseModel):
+    task_items: List[TaskSummaryModel] = Field(default_factory=list)
+    progress: ActivityProgressModel = Field(default_factory=ActivityProgressModel)
@@ -0,0 +1,23 @@
+# app/models/audit.py
+
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Dict, Literal
+from datetime import datetime
+from bson import ObjectId
+from app.models.pyobjectid import PyObjectId
+
+class AuditEventModel(BaseModel):
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
+    collection: Literal["tasks", "activities"]
+    entity_id: PyObjectId
+    action: Literal["create", "update", "delete", "comment"]
+    actor: PyObjectId
+    at: datetime
+    # field -> {"from": old value, "to": new value}
+    changes: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
@@ -0,0 +1,60 @@
+# app/models/indexes.py
+
+from pymongo import ASCENDING, IndexModel
+from app.core.config import settings
+from app.models.task import TASK_SORT_FIELDS
+
+def _task_sort_indexes():
+    # (owner, sort field, _id) serves both the role filter and keyset pagination
+    indexes = []
+    for field in TASK_SORT_FIELDS:
+        for owner in ("assigned_to", "created_by"):
+            indexes.append(IndexModel(
+                [(owner, ASCENDING), (field, ASCENDING), ("_id", ASCENDING)],
+                name=f"{owner}_{field}_id",
+            ))
+        indexes.append(IndexModel(
+            [(field, ASCENDING), ("_id", ASCENDING)],
+            name=f"{field}_id",
+        ))
+    return indexes
+
+def _task_search_indexes():
+    # Multikey indexes on the app-maintained token index (see app/core/search.py)
+    return [
+        IndexModel([("assigned_to", ASCENDING), ("search_terms", ASCENDING)], name="assigned_to_search_terms"),
+        IndexModel([("created_by", ASCENDING), ("search_terms", ASCENDING)], name="created_by_search_terms"),
+        IndexModel([("search_terms", ASCENDING)], name="search_terms"),
+    ]
+
+def audit_ttl_index() -> IndexModel:
+    # Not in INDEXES: built by ensure_indexes so settings are not read at import
+    return IndexModel(
+        [("at", ASCENDING)],
+        name="at_ttl",
+        expireAfterSeconds=settings.AUDIT_RETENTION_DAYS * 24 * 3600,
+    )
+
+# Collection name -> indexes the routers rely on
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "tasks": _task_sort_indexes() + _task_search_indexes(),
+    "comments": [
+        IndexModel([("task_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)], name="task_id_timestamp_id"),
+    ],
+    "activities": [
+        IndexModel([("manager_id", ASCENDING)], name="manager_id"),
+        # Finds the activities a task belongs to when its counters change
+        IndexModel([("tasks", ASCENDING)], name="tasks"),
+    ],
+    "audit": [
+        # GET /tasks/{id}/history pages newest first
+        IndexModel([("entity_id", ASCENDING), ("at", ASCENDING), ("_id", ASCENDING)], name="entity_id_at_id"),
+    ],
+    "token_revocations": [
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
@@ -0,0 +1,15 @@
+# app/models/sharding.py
+
+# Shard key per collection for the docker-shard-db cluster. Collections not
+# listed (users, activity_progress) stay unsharded on the primary shard.
+SHARD_KEYS = {
+    # Every single-task read and write is addressed by _id, and the list
+    # query is an $or over two user fields that no single key could target
+    "tasks": {"_id": "hashed"},
+    # Comment pages and deletes always filter by task_id
+    "comments": {"task_id": "hashed"},
+    # get_activities and every manager's reads/writes filter by manager_id
+    "activities": {"manager_id": "hashed"},
+    # Write-heavy; history pages filter by entity_id
+    "audit": {"entity_id": "hashed"},
+}
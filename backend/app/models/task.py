@@ -6,11 +6,19 @@ from datetime import datetime
 from bson import ObjectId
 from app.models.pyobjectid import PyObjectId
 
+# Fields GET /tasks can sort (and keyset-paginate) by
+TASK_SORT_FIELDS = ["project", "priority", "created_at", "updated_at"]
+
 class CommentModel(BaseModel):
     user_id: PyObjectId
     content: str
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
+
 class TaskCreateModel(BaseModel):
     title: str
     description: Optional[str] = None
@@ -33,7 +41,9 @@ class TaskResponseModel(BaseModel):
     status: Literal["Pending", "In Progress", "Completed"]
     created_by: PyObjectId
     assigned_to: PyObjectId
+    # Only the latest comments are embedded; see GET /tasks/{id}/comments
     comments: List[CommentModel] = Field(default_factory=list)
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -42,3 +52,93 @@ class TaskResponseModel(BaseModel):
         arbitrary_types_allowed=True,
         json_encoders={PyObjectId: str},
     )
+
+# Slim list schema for GET /tasks?view=summary or ?fields=...
+class TaskSummaryModel(BaseModel):
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
+    title: Optional[str] = None
+    description: Optional[str] = None
+    priority: Optional[Literal["High", "Medium", "Low"]] = None
+    status: Optional[Literal["Pending", "In Progress", "Completed"]] = None
+    created_by: Optional[PyObjectId] = None
+    assigned_to: Optional[PyObjectId] = None
+    comment_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
+
+# CSV export columns (embedded comments are left to the NDJSON format)
+TASK_EXPORT_COLUMNS = [
+    "_id", "title", "description", "priority", "status", "assigned_to", "created_by",
+    "comment_count", "created_at", "updated_at",
+]
+
+TASK_SUMMARY_FIELDS = ["title", "priority", "status", "assigned_to", "updated_at"]
+
+class CommentResponseModel(BaseModel):
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
+    task_id: PyObjectId
+    user_id: PyObjectId
+    content: str
+    timestamp: datetime
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
+
+class TaskBulkUpdateModel(TaskUpdateModel):
+    id: PyObjectId
+
+class TaskBulkDeleteModel(BaseModel):
+    ids: List[PyObjectId]
+
+class BulkItemErrorModel(BaseModel):
+    index: int
+    id: Optional[PyObjectId] = None
+    detail: str
+
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
+
+class BulkResultModel(BaseModel):
+    # ids written, in request order; errors refer to positions in the request
+    ids: List[PyObjectId] = Field(default_factory=list)
+    errors: List[BulkItemErrorModel] = Field(default_factory=list)
+
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
+
+class ImportRowErrorModel(BaseModel):
+    # row is the NDJSON line / CSV record number, 1-based
+    row: int
+    detail: str
+
+class TaskImportJobModel(BaseModel):
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
+    status: Literal["queued", "running", "completed", "failed"]
+    filename: Optional[str] = None
+    format: Literal["ndjson", "csv"]
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    # Only the first TASK_IMPORT_MAX_ERRORS errors are kept
+    errors: List[ImportRowErrorModel] = Field(default_factory=list)
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={PyObjectId: str},
+    )
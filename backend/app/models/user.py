@@ -22,6 +22,9 @@ class UserResponseModel(BaseModel):
         json_encoders={PyObjectId: str},
     )
 
+class TokenRefreshModel(BaseModel):
+    refresh_token: str
+
 class UserUpdateModel(BaseModel):
     email: Optional[EmailStr] = None
     password: Optional[str] = None
@@ -1,18 +1,38 @@
 # app/routers/activity.py
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, Request
+from typing import List, Optional
 from datetime import datetime
 from app.models.activity import (
     ActivityCreateModel,
     ActivityUpdateModel,
     ActivityResponseModel,
+    ActivitySummaryModel,
+    ACTIVITY_SUMMARY_FIELDS,
+    ACTIVITY_COMPUTED_FIELDS,
+    ACTIVITY_EXPORT_COLUMNS,
+    ActivityDetailModel,
+    ActivityProgressModel,
 )
 from app.core.auth import get_current_user
+from app.core.config import settings
 from app.core.roles import has_roles
+from app.core.utils import parse_fields
+from app.core.responses import rows_response, row_response
+from app.core.export import check_format, export_response
+from app.core.http_cache import document_response, list_response, make_etag
 from app.db.connection import mongodb
+from app.db.activity_progress import (
+    PROGRESS_COLLECTION,
+    expand_pipeline,
+    progress_from_tasks,
+    rebuild_progress,
+)
+from app.db.audit import audit_event, audit_log, diff
+from app.db.versions import bump_versions, owners, read_version, version_scope
 from app.models.pyobjectid import PyObjectId
 from bson.errors import InvalidId
+from pymongo import ReturnDocument
 from app.models.user import UserResponseModel
 
 router = APIRouter(
@@ -36,22 +56,72 @@ async def create_activity(
     activity_dict["updated_at"] = datetime.utcnow()
     result = await mongodb.db["activities"].insert_one(activity_dict)
     activity_dict["_id"] = result.inserted_id
+    if settings.ACTIVITY_PROGRESS_COUNTERS:
+        await rebuild_progress(mongodb.db, activity_dict)
+    await bump_versions(mongodb.db, "activities", owners("activities", activity_dict))
+    audit_log().emit(audit_event(
+        "activities", "create", activity_dict["_id"], current_user.id, diff(None, activity_dict),
+        owners("activities", activity_dict),
+    ))
     return ActivityResponseModel(**activity_dict)
 
 # Get All Activities
 @router.get("/", response_model=List[ActivityResponseModel])
-async def get_activities(current_user: UserResponseModel = Depends(get_current_user)):
-    query = {}
-    if "admin" not in current_user.roles:
-        query["manager_id"] = current_user.id
-    activities_cursor = mongodb.db["activities"].find(query)
+async def get_activities(
+    request: Request,
+    view: str = "full",
+    fields: Optional[str] = None,
+    current_user: UserResponseModel = Depends(get_current_user),
+):
+    # If-None-Match / response cache against the caller's activities version
+    version = await read_version(mongodb.db, "activities", current_user)
+    return await list_response(
+        request, version, version_scope(current_user),
+        lambda: _get_activities(view, fields, current_user),
+    )
+
+async def _get_activities(view, fields, current_user):
+    # view=summary / fields=a,b push a projection down to Mongo
+    try:
+        selected = parse_fields(
+            fields, view, ActivitySummaryModel.model_fields.keys() - {"id"}, ACTIVITY_SUMMARY_FIELDS
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    projection = None
+    if selected is not None:
+        projection = {field: ACTIVITY_COMPUTED_FIELDS.get(field, 1) for field in selected}
+
+    activities_cursor = mongodb.list_db["activities"].find(_activity_owner_filter(current_user), projection)
     activities = await activities_cursor.to_list(length=100)
-    return [ActivityResponseModel(**activity) for activity in activities]
+    if selected is not None:
+        return rows_response(ActivitySummaryModel, activities, selected)
+    return rows_response(ActivityResponseModel, activities)
+
+def _activity_owner_filter(current_user) -> dict:
+    if "admin" in current_user.roles:
+        return {}
+    return {"manager_id": current_user.id}
 
-# Get Activity by ID
-@router.get("/{activity_id}", response_model=ActivityResponseModel)
+# Export every visible activity as NDJSON or CSV, streamed from the cursor
+@router.get("/export")
+async def export_activities(
+    format: str = "ndjson",
+    gzip: bool = False,
+    current_user: UserResponseModel = Depends(get_current_user),
+):
+    check_format(format)
+    activities_cursor = mongodb.read_db["activities"].find(
+        _activity_owner_filter(current_user)
+    ).sort("_id", 1).batch_size(settings.EXPORT_BATCH_SIZE)
+    return export_response(activities_cursor, format, "activities", ACTIVITY_EXPORT_COLUMNS, gzip)
+
+# Get Activity by ID (?expand=tasks adds its tasks and progress, in one query)
+@router.get("/{activity_id}", response_model=ActivityDetailModel)
 async def get_activity(
+    request: Request,
     activity_id: str,
+    expand: Optional[str] = None,
     current_user: UserResponseModel = Depends(get_current_user),
 ):
     try:
@@ -59,17 +129,58 @@ async def get_activity(
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid activity ID")
 
-    activity = await mongodb.db["activities"].find_one({"_id": activity_obj_id})
+    if expand is not None:
+        if expand != "tasks":
+            raise HTTPException(status_code=400, detail="Invalid expand value")
+        activity = await _expanded_activity(activity_obj_id, current_user)
+        return row_response(ActivityDetailModel, activity)
+
+    # manager_id in the filter also routes the read to a single shard
+    activity = await mongodb.db["activities"].find_one(
+        _activity_access_filter(activity_obj_id, current_user)
+    )
     if activity is None:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        await _raise_activity_not_writable(activity_obj_id)
+
+    # Not for ?expand=tasks, which also changes when its tasks do
+    etag = make_etag(activity["_id"], activity.get("updated_at"))
+    return document_response(request, etag, lambda: row_response(ActivityResponseModel, activity))
+
+# Get Activity progress (task counts by status and priority)
+@router.get("/{activity_id}/progress", response_model=ActivityProgressModel)
+async def get_activity_progress(
+    activity_id: str,
+    current_user: UserResponseModel = Depends(get_current_user),
+):
+    try:
+        activity_obj_id = PyObjectId(activity_id)
+    except (InvalidId, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid activity ID")
 
-    if (
-        activity["manager_id"] != current_user.id
-        and "admin" not in current_user.roles
-    ):
-        raise HTTPException(status_code=403, detail="Not authorized")
+    if settings.ACTIVITY_PROGRESS_COUNTERS:
+        # O(1): the counter document carries manager_id for the access check
+        counters = await mongodb.db[PROGRESS_COLLECTION].find_one(
+            _activity_access_filter(activity_obj_id, current_user)
+        )
+        if counters is not None:
+            return ActivityProgressModel(**counters)
 
-    return ActivityResponseModel(**activity)
+    activity = await _expanded_activity(activity_obj_id, current_user)
+    if settings.ACTIVITY_PROGRESS_COUNTERS:
+        # First read of an activity created before counters were enabled
+        await rebuild_progress(mongodb.db, activity)
+    return ActivityProgressModel(**activity["progress"])
+
+async def _expanded_activity(activity_obj_id, current_user) -> dict:
+    activities_cursor = mongodb.db["activities"].aggregate(
+        expand_pipeline(_activity_access_filter(activity_obj_id, current_user))
+    )
+    activities = await activities_cursor.to_list(length=1)
+    if not activities:
+        await _raise_activity_not_writable(activity_obj_id)
+    activity = activities[0]
+    activity["progress"] = progress_from_tasks(activity["task_items"])
+    return activity
 
 # Update Activity
 @router.put("/{activity_id}", response_model=ActivityResponseModel)
@@ -83,19 +194,25 @@ async def update_activity(
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid activity ID")
 
-    activity = await mongodb.db["activities"].find_one({"_id": activity_obj_id})
-    if activity is None:
-        raise HTTPException(status_code=404, detail="Activity not found")
-
-    if activity["manager_id"] != current_user.id and "admin" not in current_user.roles:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
     update_data = activity_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
-    await mongodb.db["activities"].update_one(
-        {"_id": activity_obj_id}, {"$set": update_data}
+    # The pre-image feeds the audit diff; the post-image is the pre-image
+    # with the $set applied
+    before = await mongodb.db["activities"].find_one_and_update(
+        await _activity_write_filter(activity_obj_id, current_user),
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE,
     )
-    updated_activity = await mongodb.db["activities"].find_one({"_id": activity_obj_id})
+    if before is None:
+        await _raise_activity_not_writable(activity_obj_id)
+    updated_activity = {**before, **update_data}
+    if settings.ACTIVITY_PROGRESS_COUNTERS and "tasks" in update_data:
+        await rebuild_progress(mongodb.db, updated_activity)
+    await bump_versions(mongodb.db, "activities", owners("activities", updated_activity))
+    audit_log().emit(audit_event(
+        "activities", "update", activity_obj_id, current_user.id, diff(before, updated_activity, update_data),
+        owners("activities", before, updated_activity),
+    ))
     return ActivityResponseModel(**updated_activity)
 
 # Delete Activity
@@ -109,12 +226,44 @@ async def delete_activity(
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid activity ID")
 
-    activity = await mongodb.db["activities"].find_one({"_id": activity_obj_id})
+    activity = await mongodb.db["activities"].find_one_and_delete(
+        await _activity_write_filter(activity_obj_id, current_user),
+        projection={"_id": 1, "manager_id": 1, "activity_name": 1},
+    )
     if activity is None:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        await _raise_activity_not_writable(activity_obj_id)
+    if settings.ACTIVITY_PROGRESS_COUNTERS:
+        await mongodb.db[PROGRESS_COLLECTION].delete_one({"_id": activity_obj_id})
+    await bump_versions(mongodb.db, "activities", owners("activities", activity))
+    audit_log().emit(audit_event(
+        "activities", "delete", activity_obj_id, current_user.id, diff(activity, None),
+        owners("activities", activity),
+    ))
+    return
+
+def _activity_access_filter(activity_obj_id, current_user) -> dict:
+    # Managers may only write their own activities; checked inside the write
+    query = {"_id": activity_obj_id}
+    if "admin" not in current_user.roles:
+        query["manager_id"] = current_user.id
+    return query
 
-    if activity["manager_id"] != current_user.id and "admin" not in current_user.roles:
-        raise HTTPException(status_code=403, detail="Not authorized")
+async def _activity_write_filter(activity_obj_id, current_user) -> dict:
+    query = _activity_access_filter(activity_obj_id, current_user)
+    if "manager_id" not in query and settings.MONGODB_SHARDED:
+        # Admin writes: findAndModify on a sharded collection needs the shard
+        # key before MongoDB 7.1, so look it up first
+        activity = await mongodb.db["activities"].find_one(
+            {"_id": activity_obj_id}, {"manager_id": 1}
+        )
+        if activity is None:
+            raise HTTPException(status_code=404, detail="Activity not found")
+        query["manager_id"] = activity["manager_id"]
+    return query
 
-    await mongodb.db["activities"].delete_one({"_id": activity_obj_id})
-    return
+async def _raise_activity_not_writable(activity_obj_id):
+    # Only reached when an atomic write matched nothing
+    activity = await mongodb.db["activities"].find_one({"_id": activity_obj_id}, {"_id": 1})
+    if activity is None:
+        raise HTTPException(status_code=404, detail="Activity not found")
+    raise HTTPException(status_code=403, detail="Not authorized")
@@ -0,0 +1,30 @@
+# app/routers/admin.py
+
+from fastapi import APIRouter, Depends
+from app.core.roles import has_roles
+from app.db.connection import mongodb, pool_snapshot
+from app.db.indexes import index_coverage_report
+from app.models.user import UserResponseModel
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+)
+
+# Explain every router query shape and flag the ones not served by an index
+@router.get("/indexes/coverage")
+async def get_index_coverage(
+    current_user: UserResponseModel = Depends(has_roles(["admin"]))
+):
+    report = await index_coverage_report(mongodb.db)
+    return {
+        "uncovered": [entry["name"] for entry in report if not entry["indexed"]],
+        "shapes": report,
+    }
+
+# Connection pool utilization per server (also exported as metrics)
+@router.get("/db/pool")
+async def get_pool_stats(
+    current_user: UserResponseModel = Depends(has_roles(["admin"]))
+):
+    return pool_snapshot()
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, create_access_token, create_refresh_token
+from app.core.security import decode_access_token, public_jwks
+from app.core.auth import get_current_user, principal_cache
+from app.core.revocation import revoke_user_tokens
 from app.db.connection import mongodb
 from app.core.config import settings
+from app.models.user import TokenRefreshModel, UserResponseModel
+from app.models.pyobjectid import PyObjectId
 from datetime import timedelta
 
 router = APIRouter(
@@ -10,6 +15,22 @@ router = APIRouter(
     tags=["Authentication"],
 )
 
+def _issue_tokens(user: dict) -> dict:
+    version = user.get("token_version", 0)
+    claims = {"ver": version}
+    if settings.JWT_EMBED_ROLES:
+        claims.update({"roles": user["roles"], "email": user["email"]})
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        subject=str(user["_id"]),
+        expires_delta=access_token_expires,
+        claims=claims,
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": create_refresh_token(str(user["_id"]), version),
+        "token_type": "bearer",
+    }
 
 # first logic
 @router.post("/login", response_model=dict)
@@ -17,11 +38,36 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     user = await mongodb.db["users"].find_one({"email": form_data.username})
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    if not verify_password(form_data.password, user["password_hash"]):
+    if not await verify_password_async(form_data.password, user["password_hash"]):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=str(user["_id"]),
-        expires_delta=access_token_expires
+    return _issue_tokens(user)
+
+# Exchange a refresh token for a new token pair; roles are re-read from Mongo here
+@router.post("/refresh", response_model=dict)
+async def refresh_access_token(body: TokenRefreshModel):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+    )
+    payload = decode_access_token(body.refresh_token)
+    if payload is None or payload.get("typ") != "refresh":
+        raise credentials_exception
+    user = await mongodb.db["users"].find_one(
+        {"_id": PyObjectId(payload["sub"])},
+        {"email": 1, "roles": 1, "token_version": 1},
     )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    if user is None or user.get("token_version", 0) != payload.get("ver"):
+        raise credentials_exception
+    return _issue_tokens(user)
+
+# Revoke every access and refresh token issued to the current user
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(current_user: UserResponseModel = Depends(get_current_user)):
+    await revoke_user_tokens(mongodb.db, current_user.id)
+    principal_cache().invalidate(str(current_user.id))
+    return
+
+# Public keys for RS256/ES256 so other services can verify tokens locally
+@router.get("/jwks.json", response_model=dict)
+async def jwks():
+    return public_jwks()
@@ -0,0 +1,29 @@
+# app/routers/health.py
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.lifecycle import state
+from app.db.connection import ping_mongo
+
+router = APIRouter(tags=["Health"])
+
+# Liveness: the worker's event loop is responding
+@router.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+# Readiness: warmed up, not draining and MongoDB (mongos) answers a ping
+@router.get("/readyz")
+async def readyz():
+    checks = {
+        "warmed_up": state.ready,
+        "draining": state.draining,
+        "mongodb": await ping_mongo(settings.READINESS_PING_TIMEOUT_SECONDS) if state.ready else False,
+    }
+    ready = checks["warmed_up"] and not checks["draining"] and checks["mongodb"]
+    return JSONResponse(
+        {"status": "ready" if ready else "unavailable", **checks},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
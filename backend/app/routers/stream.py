@@ -0,0 +1,103 @@
+# app/routers/stream.py
+
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.responses import dumps
+from app.core.roles import has_roles
+from app.db.change_feed import Subscriber, task_feed
+from app.db.connection import mongodb
+
+# Included before the tasks router so /tasks/stream is not taken for a task id
+router = APIRouter(
+    prefix="/tasks",
+    tags=["Tasks"],
+)
+
+PING = {"op": "ping"}
+RESET = {"op": "reset"}
+
+async def _next_event(subscriber: Subscriber) -> Optional[dict]:
+    # PING after a quiet heartbeat interval, None once the feed closed the subscriber
+    try:
+        return await asyncio.wait_for(subscriber.queue.get(), settings.STREAM_HEARTBEAT_SECONDS)
+    except asyncio.TimeoutError:
+        return PING
+
+async def _sse_events(request: Request, subscriber: Subscriber, resumed: bool):
+    try:
+        if not resumed:
+            # last_event_id fell out of the replay buffer: re-read GET /tasks/
+            yield b"event: reset\ndata: {}\n\n"
+        while True:
+            event = await _next_event(subscriber)
+            if event is PING:
+                if await request.is_disconnected():
+                    break
+                yield b": ping\n\n"
+            elif event is None:
+                if subscriber.dropped:
+                    yield b"event: dropped\ndata: {}\n\n"
+                break
+            else:
+                yield b"id: " + event["id"].encode() + b"\nevent: change\ndata: " + dumps(event) + b"\n\n"
+    finally:
+        task_feed().unsubscribe(subscriber)
+
+# Server-Sent Events; browsers resend the last id in Last-Event-ID on reconnect
+@router.get("/stream")
+async def stream_tasks_sse(
+    request: Request,
+    last_event_id: Optional[str] = Header(default=None),
+    current_user = Depends(has_roles(["admin", "manager", "user"])),
+):
+    subscriber, resumed = task_feed().subscribe(mongodb.db, current_user, last_event_id)
+    return StreamingResponse(
+        _sse_events(request, subscriber, resumed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# WebSocket; browsers cannot set headers here, so the token may come as ?token=
+@router.websocket("/stream")
+async def stream_tasks_ws(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    last_event_id: Optional[str] = None,
+):
+    authorization = websocket.headers.get("authorization", "")
+    if token is None and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    try:
+        current_user = await get_current_user(token or "")
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if not current_user.roles:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber, resumed = task_feed().subscribe(mongodb.db, current_user, last_event_id)
+    try:
+        if not resumed:
+            await websocket.send_text(dumps(RESET).decode())
+        while True:
+            event = await _next_event(subscriber)
+            if event is None:
+                if subscriber.dropped:
+                    # Slow consumer: reconnect with the last received id
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                else:
+                    await websocket.close()
+                break
+            await websocket.send_text(dumps(event).decode())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task_feed().unsubscribe(subscriber)
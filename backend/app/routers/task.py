@@ -1,21 +1,50 @@
 # app/routers/task.py
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Body, File, Query, Request, Response, UploadFile
+from typing import Any, Dict, List, Literal, Optional
+import shutil
+import tempfile
 from datetime import datetime
-from app.models.task import TaskCreateModel, TaskUpdateModel, TaskResponseModel, CommentModel
+from app.models.task import TaskCreateModel, TaskUpdateModel, TaskResponseModel, CommentModel, TASK_SORT_FIELDS
+from app.models.task import CommentResponseModel, TaskSummaryModel, TASK_SUMMARY_FIELDS
+from app.models.task import TaskBulkUpdateModel, TaskBulkDeleteModel, BulkItemErrorModel, BulkResultModel
+from app.models.task import TASK_EXPORT_COLUMNS, TaskImportJobModel
+from app.models.audit import AuditEventModel
 from app.models.user import UserResponseModel
 from app.core.auth import get_current_user
+from app.core.config import settings
 from app.core.roles import has_roles
+from app.core.utils import encode_cursor, decode_cursor, parse_fields, validation_detail
+from app.core.responses import rows_response, row_response
+from app.core.export import check_format, export_response
+from app.core.http_cache import document_response, list_response, make_etag
+from app.core.search import search_fields, query_terms, relevance_pipeline, SEARCH_FIELDS_PROJECTION
 from app.db.connection import mongodb
+from app.db.activity_progress import apply_task_changes
+from app.db.audit import AUDIT_COLLECTION, audit_event, audit_log, diff
+from app.db.versions import bump_versions, owners, read_version, version_scope
+from app.db.task_import import (
+    IMPORT_JOBS_COLLECTION,
+    detect_format,
+    new_import_job,
+    run_import,
+    start_background_import,
+)
 from app.models.pyobjectid import PyObjectId
 from bson.errors import InvalidId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
 router = APIRouter(
     prefix="/tasks",
     tags=["Tasks"],
 )
 
+# Guarded title/description writes retried after a concurrent edit before 409
+TEXT_UPDATE_ATTEMPTS = 5
+
 # Create Task
 @router.post("/", response_model=TaskResponseModel, status_code=status.HTTP_201_CREATED)
 async def create_task(
@@ -23,14 +52,235 @@ async def create_task(
     current_user=Depends(get_current_user),
     _ = Depends(has_roles(["admin", "manager"]))
 ):
+    task_dict = _new_task_document(task, current_user)
+    result = await mongodb.db["tasks"].insert_one(task_dict)
+    task_dict["_id"] = result.inserted_id
+    await bump_versions(mongodb.db, "tasks", owners("tasks", task_dict))
+    audit_log().emit(audit_event(
+        "tasks", "create", task_dict["_id"], current_user.id, diff(None, task_dict), owners("tasks", task_dict)
+    ))
+    return TaskResponseModel(**task_dict)
+
+def _new_task_document(task: TaskCreateModel, current_user) -> dict:
     task_dict = task.dict()
     task_dict["created_by"] = current_user.id
     task_dict["assigned_to"] = task.assigned_to or current_user.id
     task_dict["created_at"] = datetime.utcnow()
     task_dict["updated_at"] = datetime.utcnow()
-    result = await mongodb.db["tasks"].insert_one(task_dict)
-    task_dict["_id"] = result.inserted_id
-    return TaskResponseModel(**task_dict)
+    task_dict["comment_count"] = 0
+    task_dict.update(search_fields(task.title, task.description))
+    return task_dict
+
+# Bulk endpoints: one role check and a fixed number of Mongo calls per request.
+# In ordered mode processing stops at the first failing item, like Mongo does.
+@router.post("/bulk", response_model=BulkResultModel)
+async def create_tasks_bulk(
+    items: List[Dict[str, Any]] = Body(...),
+    ordered: bool = True,
+    current_user = Depends(has_roles(["admin", "manager"]))
+):
+    _check_bulk_size(items)
+    docs, positions, errors = [], [], []
+    for index, item in enumerate(items):
+        try:
+            task = TaskCreateModel(**item)
+        except ValidationError as exc:
+            errors.append(BulkItemErrorModel(index=index, detail=validation_detail(exc)))
+            if ordered:
+                break
+            continue
+        docs.append(_new_task_document(task, current_user))
+        positions.append(index)
+
+    written = docs
+    if docs:
+        try:
+            await mongodb.db["tasks"].insert_many(docs, ordered=ordered)
+        except BulkWriteError as exc:
+            written = _bulk_written(docs, positions, exc, ordered, errors)
+    if written:
+        await bump_versions(mongodb.db, "tasks", owners("tasks", *written))
+        audit_log().emit(*(
+            audit_event("tasks", "create", doc["_id"], current_user.id, diff(None, doc), owners("tasks", doc))
+            for doc in written
+        ))
+    errors.sort(key=lambda error: error.index)
+    return BulkResultModel(ids=[doc["_id"] for doc in written], errors=errors)
+
+@router.patch("/bulk", response_model=BulkResultModel)
+async def update_tasks_bulk(
+    items: List[Dict[str, Any]] = Body(...),
+    ordered: bool = True,
+    current_user = Depends(has_roles(["admin", "manager", "user"]))
+):
+    _check_bulk_size(items)
+    updates, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            updates.append((index, TaskBulkUpdateModel(**item)))
+        except ValidationError as exc:
+            errors.append(BulkItemErrorModel(index=index, detail=validation_detail(exc)))
+            if ordered:
+                break
+
+    # One read resolves existence, visibility and the stored searchable fields
+    existing = await _find_tasks([update.id for _, update in updates])
+    requests, positions, written_ids, changes = [], [], [], []
+    now = datetime.utcnow()
+    for index, update in updates:
+        error = _task_access_error(existing.get(update.id), current_user)
+        if error:
+            errors.append(BulkItemErrorModel(index=index, id=update.id, detail=error))
+            if ordered:
+                break
+            continue
+        update_data = update.dict(exclude_unset=True, exclude={"id"})
+        update_data["updated_at"] = now
+        if "title" in update_data or "description" in update_data:
+            merged = {**existing[update.id], **update_data}
+            update_data.update(search_fields(merged.get("title"), merged.get("description")))
+        requests.append(UpdateOne(
+            _task_access_filter(update.id, current_user), {"$set": update_data}
+        ))
+        positions.append(index)
+        written_ids.append(update.id)
+        changes.append((existing[update.id], {**existing[update.id], **update_data}))
+
+    if requests:
+        try:
+            await mongodb.db["tasks"].bulk_write(requests, ordered=ordered)
+        except BulkWriteError as exc:
+            changes = _bulk_written(changes, positions, exc, ordered, [])
+            written_ids = _bulk_written(written_ids, positions, exc, ordered, errors)
+        if settings.ACTIVITY_PROGRESS_COUNTERS:
+            await apply_task_changes(mongodb.db, changes)
+        await bump_versions(mongodb.db, "tasks", owners("tasks", *(doc for change in changes for doc in change)))
+        audit_log().emit(*(
+            audit_event(
+                "tasks", "update", before["_id"], current_user.id, diff(before, after), owners("tasks", before, after)
+            )
+            for before, after in changes
+        ))
+    errors.sort(key=lambda error: error.index)
+    return BulkResultModel(ids=written_ids, errors=errors)
+
+@router.delete("/bulk", response_model=BulkResultModel)
+async def delete_tasks_bulk(
+    payload: TaskBulkDeleteModel,
+    current_user = Depends(has_roles(["admin", "manager"]))
+):
+    _check_bulk_size(payload.ids)
+    existing = await _find_tasks(payload.ids)
+    deletable, errors = [], []
+    for index, task_obj_id in enumerate(payload.ids):
+        error = _task_access_error(existing.get(task_obj_id), current_user)
+        if error:
+            errors.append(BulkItemErrorModel(index=index, id=task_obj_id, detail=error))
+        elif task_obj_id not in deletable:
+            deletable.append(task_obj_id)
+
+    if deletable:
+        query = _task_access_filter({"$in": deletable}, current_user)
+        await mongodb.db["tasks"].delete_many(query)
+        await mongodb.db["comments"].delete_many({"task_id": {"$in": deletable}})
+        if settings.ACTIVITY_PROGRESS_COUNTERS:
+            await apply_task_changes(mongodb.db, [(existing[task_id], None) for task_id in deletable])
+        await bump_versions(mongodb.db, "tasks", owners("tasks", *(existing[task_id] for task_id in deletable)))
+        audit_log().emit(*(
+            audit_event(
+                "tasks", "delete", task_id, current_user.id, diff(existing[task_id], None),
+                owners("tasks", existing[task_id]),
+            )
+            for task_id in deletable
+        ))
+    return BulkResultModel(ids=deletable, errors=errors)
+
+# Import tasks from an NDJSON or CSV upload, validated and inserted in chunks.
+# Large uploads (or ?background=true) return 202 and run as a job.
+@router.post("/import", response_model=TaskImportJobModel)
+async def import_tasks(
+    response: Response,
+    file: UploadFile = File(...),
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    background: bool = False,
+    current_user = Depends(has_roles(["admin", "manager"]))
+):
+    format = detect_format(file.filename, format)
+    job = await new_import_job(mongodb.db, current_user.id, file.filename, format)
+
+    def build_document(task: TaskCreateModel) -> dict:
+        return _new_task_document(task, current_user)
+
+    if background or (file.size or 0) > settings.TASK_IMPORT_SYNC_MAX_BYTES:
+        # The upload is closed with the request, so the job reads its own copy
+        stream = await run_in_threadpool(_copy_upload, file.file)
+        start_background_import(mongodb.db, job, stream, build_document)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return TaskImportJobModel(**job)
+    job = await run_import(mongodb.db, job, file.file, build_document)
+    return TaskImportJobModel(**job)
+
+def _copy_upload(source):
+    stream = tempfile.TemporaryFile()
+    shutil.copyfileobj(source, stream)
+    stream.seek(0)
+    return stream
+
+@router.get("/import/{job_id}", response_model=TaskImportJobModel)
+async def get_import_job(
+    job_id: str,
+    current_user = Depends(has_roles(["admin", "manager"]))
+):
+    try:
+        job_obj_id = PyObjectId(job_id)
+    except (InvalidId, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    query = {"_id": job_obj_id}
+    if "admin" not in current_user.roles:
+        query["user_id"] = current_user.id
+    job = await mongodb.db[IMPORT_JOBS_COLLECTION].find_one(query)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return TaskImportJobModel(**job)
+
+def _check_bulk_size(items: list):
+    if len(items) > settings.TASK_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.TASK_BULK_MAX_ITEMS} items per request",
+        )
+
+async def _find_tasks(task_ids: list) -> dict:
+    if not task_ids:
+        return {}
+    cursor = mongodb.db["tasks"].find(
+        {"_id": {"$in": task_ids}},
+        {"title": 1, "description": 1, "assigned_to": 1, "created_by": 1, "status": 1, "priority": 1},
+    )
+    return {task["_id"]: task async for task in cursor}
+
+def _task_access_error(task: Optional[dict], current_user) -> Optional[str]:
+    if task is None:
+        return "Task not found"
+    if (
+        task.get("assigned_to") != current_user.id
+        and task.get("created_by") != current_user.id
+        and "admin" not in current_user.roles
+    ):
+        return "Not authorized"
+    return None
+
+def _bulk_written(written: list, positions: List[int], exc: BulkWriteError, ordered: bool, errors: list) -> list:
+    # Maps Mongo write errors back to request positions and returns what was written
+    failed = set()
+    for write_error in exc.details.get("writeErrors", []):
+        failed.add(write_error["index"])
+        errors.append(BulkItemErrorModel(
+            index=positions[write_error["index"]], detail=write_error["errmsg"]
+        ))
+    if ordered:
+        return written[:min(failed)] if failed else written
+    return [item for i, item in enumerate(written) if i not in failed]
 
 # Endpoint untuk menambahkan komentar ke task
 @router.post("/{task_id}/comments", response_model=TaskResponseModel)
@@ -44,62 +294,266 @@ async def add_comment(
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid task ID")
 
-    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id})
-    if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     # Tambahkan informasi user_id dan timestamp ke komentar
     comment.user_id = current_user.id
     comment.timestamp = datetime.utcnow()
 
-    # Tambahkan komentar ke task
-    await mongodb.db["tasks"].update_one(
-        {"_id": task_obj_id},
-        {"$push": {"comments": comment.dict()}}
+    # Task hanya menyimpan komentar terbaru; semua komentar ada di koleksi "comments"
+    comment_dict = comment.dict()
+    updated_task = await mongodb.db["tasks"].find_one_and_update(
+        _task_access_filter(task_obj_id, current_user),
+        {
+            "$inc": {"comment_count": 1},
+            "$push": {"comments": {
+                "$each": [comment_dict],
+                "$slice": -settings.TASK_LATEST_COMMENTS,
+            }},
+        },
+        projection=SEARCH_FIELDS_PROJECTION,
+        return_document=ReturnDocument.AFTER,
     )
-
-    # Dapatkan task yang diperbarui
-    updated_task = await mongodb.db["tasks"].find_one({"_id": task_obj_id})
+    if updated_task is None:
+        await _raise_task_not_writable(task_obj_id)
+    await mongodb.db["comments"].insert_one({"task_id": task_obj_id, **comment_dict})
+    await bump_versions(mongodb.db, "tasks", owners("tasks", updated_task))
+    audit_log().emit(audit_event(
+        "tasks", "comment", task_obj_id, current_user.id, diff(None, {"comment": comment.content}),
+        owners("tasks", updated_task),
+    ))
     return TaskResponseModel(**updated_task)
 
+# Page through all comments of a task, newest first
+@router.get("/{task_id}/comments", response_model=List[CommentResponseModel])
+async def get_comments(
+    task_id: str,
+    limit: int = Query(20, ge=1),
+    cursor: Optional[str] = None,
+    current_user: UserResponseModel = Depends(get_current_user)
+):
+    try:
+        task_obj_id = PyObjectId(task_id)
+    except (InvalidId, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid task ID")
+
+    task = await mongodb.db["tasks"].find_one(
+        _task_access_filter(task_obj_id, current_user), {"_id": 1}
+    )
+    if task is None:
+        await _raise_task_not_writable(task_obj_id)
+
+    comments, headers = await _newest_first_page("comments", {"task_id": task_obj_id}, "timestamp", limit, cursor)
+    return rows_response(CommentResponseModel, comments, headers=headers)
+
+# Page through the audit trail of a task, newest first
+@router.get("/{task_id}/history", response_model=List[AuditEventModel])
+async def get_task_history(
+    task_id: str,
+    limit: int = Query(20, ge=1),
+    cursor: Optional[str] = None,
+    current_user: UserResponseModel = Depends(get_current_user)
+):
+    try:
+        task_obj_id = PyObjectId(task_id)
+    except (InvalidId, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid task ID")
+
+    query = {"entity_id": task_obj_id}
+    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id}, {"assigned_to": 1, "created_by": 1})
+    if task is not None:
+        if _task_access_error(task, current_user):
+            raise HTTPException(status_code=403, detail="Not authorized")
+    elif "admin" not in current_user.roles:
+        # Deleted task: its events record who it belonged to
+        query["owners"] = current_user.id
+    events, headers = await _newest_first_page(AUDIT_COLLECTION, query, "at", limit, cursor)
+    if task is None and not events and not cursor:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return rows_response(AuditEventModel, events, headers=headers)
+
+async def _newest_first_page(collection: str, query: dict, sort_field: str, limit: int, cursor: Optional[str]):
+    # One keyset page sorted by (sort_field, _id) descending, and the
+    # X-Next-Cursor header when another page may follow. The upper bound is
+    # checked here rather than with Query(le=...), which would read settings
+    # at import
+    if limit > settings.TASK_PAGE_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be at most {settings.TASK_PAGE_MAX_LIMIT}")
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            query = {**query, **_keyset_filter(sort_field, -1, position["v"], position["id"])}
+        except (ValueError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    docs_cursor = mongodb.db[collection].find(query).sort(
+        [(sort_field, -1), ("_id", -1)]
+    ).limit(limit)
+    docs = await docs_cursor.to_list(length=limit)
+    headers = {}
+    if len(docs) == limit:
+        headers["X-Next-Cursor"] = encode_cursor({"v": docs[-1][sort_field], "id": docs[-1]["_id"]})
+    return docs, headers
+
+def _task_access_filter(task_obj_id, current_user) -> dict:
+    # Same visibility rule as get_task, applied inside the write itself
+    query = {"_id": task_obj_id}
+    if "admin" not in current_user.roles:
+        query["$or"] = [
+            {"assigned_to": current_user.id},
+            {"created_by": current_user.id}
+        ]
+    return query
+
+async def _raise_task_not_writable(task_obj_id):
+    # Only reached when an atomic write matched nothing
+    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id}, {"_id": 1})
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    raise HTTPException(status_code=403, detail="Not authorized")
+
 
 # Read All Tasks (Accessible based on roles)
 @router.get("/", response_model=List[TaskResponseModel])
 async def get_tasks(
+    request: Request,
     skip: int = 0,
     limit: int = 5,
     sort_by: str = "project",
     order: int = 1,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    view: str = "full",
+    fields: Optional[str] = None,
     current_user: UserResponseModel = Depends(get_current_user)
 ):
-    query = {}
-    if "admin" not in current_user.roles:
-        query["$or"] = [
-            {"assigned_to": current_user.id},
-            {"created_by": current_user.id}
-        ]
+    # If-None-Match / response cache against the caller's tasks version
+    version = await read_version(mongodb.db, "tasks", current_user)
+    return await list_response(
+        request, version, version_scope(current_user),
+        lambda: _get_tasks(skip, limit, sort_by, order, search, cursor, view, fields, current_user),
+    )
+
+async def _get_tasks(skip, limit, sort_by, order, search, cursor, view, fields, current_user):
+    # view=summary / fields=a,b push a projection down to Mongo
+    try:
+        selected = parse_fields(
+            fields, view, TaskSummaryModel.model_fields.keys() - {"id"}, TASK_SUMMARY_FIELDS
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    projection = SEARCH_FIELDS_PROJECTION
+    if selected is not None:
+        projection = {field: 1 for field in selected}
+
+    query = _task_owner_filter(current_user)
 
     # Tambahkan kondisi pencarian jika parameter 'search' diberikan
     if search:
-        query["title"] = {"$regex": search, "$options": "i"}  # 'i' untuk case-insensitive
+        terms = query_terms(search)
+        if not terms:
+            raise HTTPException(status_code=400, detail="Search term too short")
+        query["search_terms"] = {"$all": terms}
+
+    if sort_by == "relevance":
+        if not search or cursor or limit < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Relevance sorting requires 'search', a positive limit and no cursor",
+            )
+        tasks_cursor = mongodb.list_db["tasks"].aggregate(
+            relevance_pipeline(query, terms, skip, limit, None if selected is None else projection)
+        )
+        tasks = await tasks_cursor.to_list(length=limit)
+        if selected is not None:
+            return rows_response(TaskSummaryModel, tasks, selected)
+        return rows_response(TaskResponseModel, tasks)
 
     # Validasi field sort_by
-    allowed_sort_fields = ["project", "priority", "created_at", "updated_at"]
-    if sort_by not in allowed_sort_fields:
+    if sort_by not in TASK_SORT_FIELDS:
         raise HTTPException(status_code=400, detail="Invalid sort field")
+    if order not in (1, -1):
+        raise HTTPException(status_code=400, detail="Invalid sort order")
+
+    # Keyset pagination: continue after the last (sort_by, _id) of the previous page
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+            last_value, last_id = position["v"], position["id"]
+        except (ValueError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if position.get("s") != sort_by or position.get("o") != order:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort parameters")
+        query.setdefault("$and", []).append(
+            _keyset_filter(sort_by, order, last_value, last_id)
+        )
+        skip = 0
 
     # Dapatkan cursor dengan sorting dan pagination
-    tasks_cursor = mongodb.db["tasks"].find(query).sort(
-        sort_by, order
+    if selected is not None:
+        # The cursor needs the sort value even when it was not asked for
+        projection = {**projection, sort_by: 1}
+    tasks_cursor = mongodb.list_db["tasks"].find(query, projection).sort(
+        [(sort_by, order), ("_id", order)]
     ).skip(skip).limit(limit)
 
     tasks = await tasks_cursor.to_list(length=limit)
-    return [TaskResponseModel(**task) for task in tasks]
+    headers = {}
+    if limit > 0 and len(tasks) == limit:
+        last_task = tasks[-1]
+        headers["X-Next-Cursor"] = encode_cursor({
+            "s": sort_by,
+            "o": order,
+            "v": last_task.get(sort_by),
+            "id": last_task["_id"],
+        })
+    if selected is not None:
+        return rows_response(TaskSummaryModel, tasks, selected, headers=headers)
+    return rows_response(TaskResponseModel, tasks, headers=headers)
+
+def _task_owner_filter(current_user) -> dict:
+    if "admin" in current_user.roles:
+        return {}
+    return {"$or": [
+        {"assigned_to": current_user.id},
+        {"created_by": current_user.id}
+    ]}
+
+# Export every visible task as NDJSON or CSV, streamed from the cursor
+@router.get("/export")
+async def export_tasks(
+    format: str = "ndjson",
+    gzip: bool = False,
+    current_user: UserResponseModel = Depends(get_current_user)
+):
+    check_format(format)
+    projection = SEARCH_FIELDS_PROJECTION
+    if format == "csv":
+        projection = {field: 1 for field in TASK_EXPORT_COLUMNS}
+    tasks_cursor = mongodb.read_db["tasks"].find(
+        _task_owner_filter(current_user), projection
+    ).sort("_id", 1).batch_size(settings.EXPORT_BATCH_SIZE)
+    return export_response(tasks_cursor, format, "tasks", TASK_EXPORT_COLUMNS, gzip)
+
+def _keyset_filter(sort_by: str, order: int, last_value, last_id) -> dict:
+    op = "$gt" if order == 1 else "$lt"
+    # null/missing values sort first ascending and last descending, and
+    # range operators never match them, so they need their own branch
+    if last_value is None:
+        after = [{sort_by: None, "_id": {op: last_id}}]
+        if order == 1:
+            after.append({sort_by: {"$ne": None}})
+        return {"$or": after}
+    after = [
+        {sort_by: {op: last_value}},
+        {sort_by: last_value, "_id": {op: last_id}},
+    ]
+    if order == -1:
+        after.append({sort_by: None})
+    return {"$or": after}
 
 # Read Task by ID
 @router.get("/{task_id}", response_model=TaskResponseModel)
 async def get_task(
+    request: Request,
     task_id: str,
     current_user = Depends(get_current_user),
     _ = Depends(has_roles(["admin", "manager", "user"]))
@@ -110,7 +564,7 @@ async def get_task(
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid task ID")
 
-    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id})
+    task = await mongodb.read_db["tasks"].find_one({"_id": task_obj_id}, SEARCH_FIELDS_PROJECTION)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
@@ -121,7 +575,9 @@ async def get_task(
     ):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    return TaskResponseModel(**task)
+    # comment_count covers add_comment, which leaves updated_at alone
+    etag = make_etag(task["_id"], task.get("updated_at"), task.get("comment_count"))
+    return document_response(request, etag, lambda: row_response(TaskResponseModel, task))
 
 # Update Task
 @router.put("/{task_id}", response_model=TaskResponseModel)
@@ -136,32 +592,75 @@ async def update_task(
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid task ID")
 
-    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id})
-    if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     update_data = task_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
-    await mongodb.db["tasks"].update_one(
-        {"_id": task_obj_id}, {"$set": update_data}
-    )
-    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id})
+    text_fields = {"title", "description"} & update_data.keys()
+    if len(text_fields) == 2:
+        update_data.update(search_fields(update_data["title"], update_data["description"]))
+    access_filter = _task_access_filter(task_obj_id, current_user)
+    for _ in range(TEXT_UPDATE_ATTEMPTS):
+        query, changes = access_filter, update_data
+        if len(text_fields) == 1:
+            # Only one searchable field changed, so the token index needs the
+            # stored value of the other one; the write is guarded on that
+            # value so a concurrent edit of it cannot leave stale tokens
+            (other,) = {"title", "description"} - text_fields
+            current = await mongodb.db["tasks"].find_one(access_filter, {other: 1})
+            if current is None:
+                await _raise_task_not_writable(task_obj_id)
+            text = {other: current.get(other), **update_data}
+            query = {**access_filter, other: current.get(other)}
+            changes = {**update_data, **search_fields(text.get("title"), text.get("description"))}
+        # The pre-image drives the activity counters; the post-image is just
+        # the pre-image with the $set applied
+        before = await mongodb.db["tasks"].find_one_and_update(
+            query,
+            {"$set": changes},
+            projection=SEARCH_FIELDS_PROJECTION,
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is not None:
+            break
+        if len(text_fields) != 1:
+            await _raise_task_not_writable(task_obj_id)
+    else:
+        raise HTTPException(status_code=409, detail="Task is being edited concurrently, please retry")
+    task = {**before, **changes}
+    if settings.ACTIVITY_PROGRESS_COUNTERS:
+        await apply_task_changes(mongodb.db, [(before, task)])
+    # Both owners: a reassigned task leaves one list and enters another
+    await bump_versions(mongodb.db, "tasks", owners("tasks", before, task))
+    audit_log().emit(audit_event(
+        "tasks", "update", task_obj_id, current_user.id, diff(before, task, update_data), owners("tasks", before, task)
+    ))
     return TaskResponseModel(**task)
 
 # Delete Task
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: str,
-    _ = Depends(has_roles(["admin", "manager"]))
+    current_user = Depends(has_roles(["admin", "manager"]))
 ):
     try:
         task_obj_id = PyObjectId(task_id)
     except (InvalidId, ValueError):
         raise HTTPException(status_code=400, detail="Invalid task ID")
 
-    task = await mongodb.db["tasks"].find_one({"_id": task_obj_id})
+    task = await mongodb.db["tasks"].find_one_and_delete(
+        _task_access_filter(task_obj_id, current_user),
+        # Counters and owners need status/priority/assignees; the audit event
+        # also records what was deleted
+        projection={
+            "title": 1, "description": 1, "status": 1, "priority": 1, "assigned_to": 1, "created_by": 1,
+        },
+    )
     if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    await mongodb.db["tasks"].delete_one({"_id": task_obj_id})
+        await _raise_task_not_writable(task_obj_id)
+    await mongodb.db["comments"].delete_many({"task_id": task_obj_id})
+    if settings.ACTIVITY_PROGRESS_COUNTERS:
+        await apply_task_changes(mongodb.db, [(task, None)])
+    await bump_versions(mongodb.db, "tasks", owners("tasks", task))
+    audit_log().emit(audit_event(
+        "tasks", "delete", task_obj_id, current_user.id, diff(task, None), owners("tasks", task)
+    ))
     return
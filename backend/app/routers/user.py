@@ -2,11 +2,16 @@
 
 from fastapi import APIRouter, HTTPException, status, Depends, Path
 from app.models.user import UserCreateModel, UserResponseModel
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 from app.db.connection import mongodb
 from app.core.roles import has_roles
+from app.core.auth import principal_cache
+from app.core.revocation import ALL_VERSIONS, revocations
+from app.core.config import settings
 from app.models.user import UserUpdateModel
 from app.models.pyobjectid import PyObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter(
     prefix="/users",
@@ -19,13 +24,17 @@ async def register_user(user: UserCreateModel):
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     user_dict = {
         "email": user.email,
         "password_hash": hashed_password,
         "roles": user.roles,
     }
-    result = await mongodb.db["users"].insert_one(user_dict)
+    try:
+        result = await mongodb.db["users"].insert_one(user_dict)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration (unique email index)
+        raise HTTPException(status_code=400, detail="Email already registered")
     user_dict["_id"] = result.inserted_id
     return UserResponseModel(**user_dict)
 
@@ -58,9 +67,28 @@ async def update_user(
     update_data = user_update.dict(exclude_unset=True)
     # self-update
     if "password" in update_data:
-        update_data["password_hash"] = get_password_hash(update_data.pop("password"))
-    await mongodb.db["users"].update_one({"_id": PyObjectId(user_id)}, {"$set": update_data})
-    user = await mongodb.db["users"].find_one({"_id": PyObjectId(user_id)})
+        update_data["password_hash"] = await get_password_hash_async(update_data.pop("password"))
+    # A new password ends every session; with JWT_EMBED_ROLES tokens issued
+    # before the update also carry stale roles or email
+    revoke = "password_hash" in update_data or bool(
+        settings.JWT_EMBED_ROLES and {"roles", "email"} & update_data.keys()
+    )
+    update = {"$set": update_data}
+    if revoke:
+        update["$inc"] = {"token_version": 1}
+    try:
+        user = await mongodb.db["users"].find_one_and_update(
+            {"_id": PyObjectId(user_id)},
+            update,
+            return_document=ReturnDocument.AFTER,
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    principal_cache().invalidate(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if revoke and settings.JWT_EMBED_ROLES:
+        await revocations.revoke(mongodb.db, user["_id"], user["token_version"])
     return UserResponseModel(**user)
 
 
@@ -71,6 +99,9 @@ async def delete_user(
     current_user: UserResponseModel = Depends(has_roles(["admin"]))
 ):
     result = await mongodb.db["users"].delete_one({"_id": PyObjectId(user_id)})
+    principal_cache().invalidate(user_id)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    if settings.JWT_EMBED_ROLES:
+        await revocations.revoke(mongodb.db, PyObjectId(user_id), ALL_VERSIONS)
     return
\ No newline at end of file
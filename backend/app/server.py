@@ -0,0 +1,65 @@
+# app/server.py
+#
+# Production entry point: python -m app.server
+#
+# Runs SERVER_WORKERS uvicorn worker processes sharing one listening socket.
+# Each worker has its own event loop, Mongo pool and caches (token cache,
+# response cache), so nothing is shared between them.
+
+import asyncio
+import logging
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import settings
+from app.core.lifecycle import state
+
+logger = logging.getLogger(__name__)
+
+class DrainingServer(uvicorn.Server):
+    """
+    On the first SIGTERM/SIGINT, /readyz starts failing but the worker keeps
+    serving for SHUTDOWN_DRAIN_SECONDS so the load balancer can take it out
+    of rotation first. A second signal exits immediately.
+    """
+
+    async def serve(self, sockets=None):
+        self._loop = asyncio.get_running_loop()
+        self._drain_handle = None
+        await super().serve(sockets=sockets)
+
+    def handle_exit(self, sig, frame):
+        if self._drain_handle is not None or settings.SHUTDOWN_DRAIN_SECONDS <= 0:
+            if self._drain_handle is not None:
+                self._drain_handle.cancel()
+            super().handle_exit(sig, frame)
+            return
+        logger.info("Draining for %ss before shutdown", settings.SHUTDOWN_DRAIN_SECONDS)
+        self._loop.create_task(state.begin_drain())
+        self._drain_handle = self._loop.call_later(
+            settings.SHUTDOWN_DRAIN_SECONDS, super().handle_exit, sig, frame
+        )
+
+def main():
+    config = uvicorn.Config(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        lifespan="on",
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACEFUL_TIMEOUT_SECONDS,
+    )
+    server = DrainingServer(config)
+    if config.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+if __name__ == "__main__":
+    main()
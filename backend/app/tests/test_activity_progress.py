@@ -0,0 +1,37 @@
+# app/tests/test_activity_progress.py
+
+import unittest
+from bson import ObjectId
+from app.db.activity_progress import progress_from_tasks, _counter_delta
+
+class TestActivityProgress(unittest.TestCase):
+
+    def test_progress_from_tasks(self):
+        progress = progress_from_tasks([
+            {"status": "Pending", "priority": "High"},
+            {"status": "Completed", "priority": "High"},
+        ])
+        self.assertEqual(progress, {
+            "total": 2,
+            "by_status": {"Pending": 1, "Completed": 1},
+            "by_priority": {"High": 2},
+        })
+
+    def test_counter_delta_on_update(self):
+        before = {"_id": ObjectId(), "status": "Pending", "priority": "High"}
+        after = {**before, "status": "Completed"}
+        self.assertEqual(_counter_delta(before, after), {
+            "by_status.Pending": -1,
+            "by_status.Completed": 1,
+        })
+
+    def test_counter_delta_on_delete(self):
+        before = {"_id": ObjectId(), "status": "Pending", "priority": "Low"}
+        self.assertEqual(_counter_delta(before, None), {
+            "total": -1,
+            "by_status.Pending": -1,
+            "by_priority.Low": -1,
+        })
+
+if __name__ == '__main__':
+    unittest.main()
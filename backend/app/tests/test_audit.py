@@ -0,0 +1,115 @@
+# app/tests/test_audit.py
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from anyio.from_thread import start_blocking_portal
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core.auth import get_current_user
+from app.db.audit import AUDIT_COLLECTION, AuditLog, audit_event, audit_log, diff
+from app.db.connection import mongodb
+from app.models.user import UserResponseModel
+
+class TestAuditLog(unittest.TestCase):
+
+    def test_diff_skips_unchanged_and_bookkeeping_fields(self):
+        before = {"_id": 1, "status": "Pending", "title": "A", "updated_at": 1}
+        after = {"_id": 1, "status": "Completed", "title": "A", "updated_at": 2}
+        self.assertEqual(diff(before, after), {"status": {"from": "Pending", "to": "Completed"}})
+        self.assertEqual(diff(None, {"title": "A"}), {"title": {"from": None, "to": "A"}})
+        self.assertEqual(diff(before, after, ["title"]), {})
+
+    def test_consumer_batches_and_stop_flushes(self):
+        db = AsyncMongoMockClient()["test_audit_pipeline"]
+        log = AuditLog(maxsize=100)
+        actor = ObjectId()
+
+        async def run():
+            log.start(db)
+            log.emit(*(audit_event("tasks", "update", ObjectId(), actor) for _ in range(5)))
+            # The consumer picks up full batches without waiting for the flush interval
+            for _ in range(100):
+                if await db[AUDIT_COLLECTION].count_documents({}) >= 4:
+                    break
+                await asyncio.sleep(0.01)
+            written_before_stop = await db[AUDIT_COLLECTION].count_documents({})
+            log.emit(audit_event("tasks", "delete", ObjectId(), actor))
+            await log.stop(db)
+            return written_before_stop, await db[AUDIT_COLLECTION].count_documents({})
+
+        with patch.multiple("app.db.audit.settings", AUDIT_BATCH_SIZE=2, AUDIT_FLUSH_SECONDS=10):
+            written_before_stop, written = asyncio.run(run())
+        self.assertGreaterEqual(written_before_stop, 4)
+        self.assertEqual(written, 6)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        log = AuditLog(maxsize=1)
+        log.emit(*(audit_event("tasks", "create", ObjectId(), ObjectId()) for _ in range(3)))
+        self.assertEqual(log.queue.qsize(), 1)
+
+class TestTaskHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        mongodb.db = AsyncMongoMockClient()["test_task_history"]
+        self.manager = UserResponseModel(_id=ObjectId(), email="manager@example.com", roles=["manager"])
+        app.dependency_overrides[get_current_user] = lambda: self.manager
+        self.client = TestClient(app)
+        self.client.portal = self.enterContext(start_blocking_portal())
+        # Events other tests left on the shared queue
+        self.client.portal.call(audit_log().flush, mongodb.db)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        mongodb.db = self.previous_db
+
+    def test_history_pages_newest_first(self):
+        task_id = self.client.post("/tasks/", json={"title": "Audit me", "priority": "Low"}).json()["_id"]
+        self.client.put(f"/tasks/{task_id}", json={"status": "In Progress"})
+        self.client.put(f"/tasks/{task_id}", json={"status": "Completed"})
+        self.client.portal.call(audit_log().flush, mongodb.db)
+
+        response = self.client.get(f"/tasks/{task_id}/history", params={"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        events = response.json()
+        self.assertEqual([event["action"] for event in events], ["update", "update"])
+        self.assertEqual(events[0]["changes"], {"status": {"from": "In Progress", "to": "Completed"}})
+        self.assertEqual(events[0]["actor"], str(self.manager.id))
+
+        response = self.client.get(
+            f"/tasks/{task_id}/history", params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+        )
+        events = response.json()
+        self.assertEqual([event["action"] for event in events], ["create"])
+        self.assertEqual(events[0]["changes"]["title"], {"from": None, "to": "Audit me"})
+
+    def test_history_of_other_users_task_is_forbidden(self):
+        task = {"title": "Private", "priority": "Low", "status": "Pending",
+                "created_by": ObjectId(), "assigned_to": ObjectId()}
+        task_id = self.client.portal.call(mongodb.db["tasks"].insert_one, task).inserted_id
+        self.assertEqual(self.client.get(f"/tasks/{task_id}/history").status_code, 403)
+
+    def test_history_of_deleted_task(self):
+        task_id = self.client.post("/tasks/", json={"title": "Short lived", "priority": "Low"}).json()["_id"]
+        self.client.delete(f"/tasks/{task_id}")
+        self.client.portal.call(audit_log().flush, mongodb.db)
+
+        response = self.client.get(f"/tasks/{task_id}/history")
+        self.assertEqual(response.status_code, 200)
+        events = response.json()
+        self.assertEqual([event["action"] for event in events], ["delete", "create"])
+        self.assertEqual(events[0]["changes"]["title"], {"from": "Short lived", "to": None})
+
+        owner = self.manager
+        self.manager = UserResponseModel(_id=ObjectId(), email="other@example.com", roles=["manager"])
+        self.assertEqual(self.client.get(f"/tasks/{task_id}/history").status_code, 404)
+        self.manager = UserResponseModel(_id=ObjectId(), email="admin@example.com", roles=["admin"])
+        self.assertEqual(len(self.client.get(f"/tasks/{task_id}/history").json()), 2)
+        self.manager = owner
+
+if __name__ == "__main__":
+    unittest.main()
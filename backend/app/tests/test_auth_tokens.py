@@ -0,0 +1,80 @@
+# app/tests/test_auth_tokens.py
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core.auth import get_current_user, principal_cache
+from app.core.revocation import revocations
+from app.core.security import decode_access_token, get_password_hash
+from app.db.connection import mongodb
+from app.models.user import UserResponseModel
+
+class TestAuthTokens(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        mongodb.db = AsyncMongoMockClient()["test_auth_tokens"]
+        asyncio.run(mongodb.db["users"].insert_one({
+            "email": "manager@example.com",
+            "password_hash": get_password_hash("password"),
+            "roles": ["manager"],
+        }))
+        self.embed = patch("app.core.config.settings.JWT_EMBED_ROLES", True)
+        self.embed.start()
+        revocations.min_versions.clear()
+        principal_cache().clear()
+        self.client = TestClient(app)
+        response = self.client.post(
+            "/auth/login", data={"username": "manager@example.com", "password": "password"}
+        )
+        self.tokens = response.json()
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        self.embed.stop()
+        revocations.min_versions.clear()
+        mongodb.db = self.previous_db
+
+    def auth(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_embedded_roles_skip_user_lookup(self):
+        self.assertEqual(decode_access_token(self.tokens["access_token"])["roles"], ["manager"])
+        mongodb.db = None
+        response = self.client.get("/users/me", headers=self.auth(self.tokens["access_token"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["email"], "manager@example.com")
+
+    def test_refresh_token_is_not_an_access_token(self):
+        response = self.client.get("/users/me", headers=self.auth(self.tokens["refresh_token"]))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post("/auth/refresh", json={"refresh_token": self.tokens["refresh_token"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access_token", response.json())
+
+    def test_logout_revokes_tokens(self):
+        response = self.client.post("/auth/logout", headers=self.auth(self.tokens["access_token"]))
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get("/users/me", headers=self.auth(self.tokens["access_token"]))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post("/auth/refresh", json={"refresh_token": self.tokens["refresh_token"]})
+        self.assertEqual(response.status_code, 401)
+
+    def test_admin_update_revokes_only_on_security_changes(self):
+        user_id = decode_access_token(self.tokens["access_token"])["sub"]
+        admin = UserResponseModel(_id="5f1d7c2e9b1e8a3d4c6b7a80", email="admin@example.com", roles=["admin"])
+        app.dependency_overrides[get_current_user] = lambda: admin
+        refresh = {"refresh_token": self.tokens["refresh_token"]}
+
+        with patch("app.core.config.settings.JWT_EMBED_ROLES", False):
+            self.client.put(f"/users/{user_id}", json={"email": "renamed@example.com"})
+            self.assertEqual(self.client.post("/auth/refresh", json=refresh).status_code, 200)
+            self.client.put(f"/users/{user_id}", json={"password": "changed"})
+            self.assertEqual(self.client.post("/auth/refresh", json=refresh).status_code, 401)
+
+if __name__ == '__main__':
+    unittest.main()
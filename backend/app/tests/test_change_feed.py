@@ -0,0 +1,94 @@
+# app/tests/test_change_feed.py
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+
+from app.db.change_feed import ChangeFeed
+from app.models.user import UserResponseModel
+
+def task_change(n, owner):
+    task_id = ObjectId()
+    return {
+        "_id": {"_data": f"token{n}"},
+        "ns": {"db": "projectDB", "coll": "tasks"},
+        "operationType": "update",
+        "documentKey": {"_id": task_id},
+        "fullDocument": {"_id": task_id, "title": "t", "assigned_to": owner, "created_by": owner,
+                         "search_terms": ["t"], "search_title": ["t"]},
+        "updateDescription": {"updatedFields": {"status": "Completed"}, "removedFields": []},
+    }
+
+class TestChangeFeed(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.object(ChangeFeed, "start")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.feed = ChangeFeed(buffer_size=2, replay_size=10)
+        self.alice = UserResponseModel(_id=ObjectId(), email="alice@example.com", roles=["user"])
+        self.bob = UserResponseModel(_id=ObjectId(), email="bob@example.com", roles=["user"])
+        self.admin = UserResponseModel(_id=ObjectId(), email="admin@example.com", roles=["admin"])
+
+    def test_fan_out_is_filtered_by_owner(self):
+        alice, _ = self.feed.subscribe(None, self.alice)
+        bob, _ = self.feed.subscribe(None, self.bob)
+        admin, _ = self.feed.subscribe(None, self.admin)
+        self.feed.publish(task_change(1, self.alice.id))
+        event = alice.queue.get_nowait()
+        self.assertEqual(event["fields"], ["status"])
+        self.assertNotIn("search_terms", event["document"])
+        self.assertTrue(bob.queue.empty())
+        self.assertEqual(admin.queue.qsize(), 1)
+
+    def test_delete_without_pre_image_reaches_only_admins(self):
+        bob, _ = self.feed.subscribe(None, self.bob)
+        admin, _ = self.feed.subscribe(None, self.admin)
+        task_id = ObjectId()
+        self.feed.publish({
+            "_id": {"_data": "token1"},
+            "ns": {"db": "projectDB", "coll": "tasks"},
+            "operationType": "delete",
+            "documentKey": {"_id": task_id},
+        })
+        self.assertTrue(bob.queue.empty())
+        self.assertEqual(admin.queue.get_nowait()["document_id"], task_id)
+
+    def test_slow_consumer_is_dropped(self):
+        alice, _ = self.feed.subscribe(None, self.alice)
+        for n in range(3):
+            self.feed.publish(task_change(n, self.alice.id))
+        self.assertTrue(alice.dropped)
+        self.assertNotIn(alice, self.feed.subscribers)
+        self.assertIsNone(alice.queue.get_nowait())
+
+    def test_resume_from_replay_buffer(self):
+        for n in range(3):
+            self.feed.publish(task_change(n, self.alice.id))
+        alice, resumed = self.feed.subscribe(None, self.alice, last_event_id="token1")
+        self.assertTrue(resumed)
+        self.assertEqual(alice.queue.get_nowait()["id"], "token2")
+        self.assertTrue(alice.queue.empty())
+        _, resumed = self.feed.subscribe(None, self.alice, last_event_id="unknown")
+        self.assertFalse(resumed)
+
+    def test_lost_resume_token_restarts_from_now(self):
+        self.feed.publish(task_change(1, self.alice.id))
+        self.feed.resume_token = {"_data": "token1"}
+        alice, _ = self.feed.subscribe(None, self.alice)
+        db = MagicMock()
+        db.watch.side_effect = [OperationFailure("history lost", code=286), asyncio.CancelledError()]
+        with patch("app.db.change_feed.RETRY_SECONDS", 0), self.assertRaises(asyncio.CancelledError):
+            asyncio.run(self.feed.run(db))
+        self.assertEqual(db.watch.call_args_list[0].kwargs["resume_after"], {"_data": "token1"})
+        self.assertIsNone(db.watch.call_args_list[1].kwargs["resume_after"])
+        # The subscriber reconnects with its last id and is told to reset
+        self.assertTrue(alice.dropped)
+        self.assertIsNone(alice.queue.get_nowait())
+        _, resumed = self.feed.subscribe(None, self.alice, last_event_id="token1")
+        self.assertFalse(resumed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# app/tests/test_comments.py
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from anyio.from_thread import start_blocking_portal
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core.auth import get_current_user
+from app.core.utils import encode_cursor
+from app.db.connection import mongodb
+from app.db.migrations import MIGRATIONS
+from app.models.user import UserResponseModel
+
+class TestTaskComments(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        mongodb.db = AsyncMongoMockClient()["test_task_comments"]
+        self.manager = UserResponseModel(_id=ObjectId(), email="manager@example.com", roles=["manager"])
+        app.dependency_overrides[get_current_user] = lambda: self.manager
+        self.client = TestClient(app)
+        self.client.portal = self.enterContext(start_blocking_portal())
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        mongodb.db = self.previous_db
+
+    def test_comments_page_newest_first(self):
+        task_id = self.client.post("/tasks/", json={"title": "Discuss", "priority": "Low"}).json()["_id"]
+        for content in ("first", "second", "third"):
+            self.assertEqual(self.client.post(f"/tasks/{task_id}/comments", json={
+                "user_id": str(self.manager.id), "content": content,
+            }).status_code, 200)
+
+        response = self.client.get(f"/tasks/{task_id}/comments", params={"limit": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([comment["content"] for comment in response.json()], ["third", "second"])
+
+        response = self.client.get(
+            f"/tasks/{task_id}/comments", params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+        )
+        self.assertEqual([comment["content"] for comment in response.json()], ["first"])
+        # A short page is the last one
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+    def test_invalid_cursor(self):
+        task_id = self.client.post("/tasks/", json={"title": "Discuss", "priority": "Low"}).json()["_id"]
+        response = self.client.get(f"/tasks/{task_id}/comments", params={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        forged = encode_cursor({"v": {"$regex": "."}, "id": ObjectId()})
+        response = self.client.get(f"/tasks/{task_id}/comments", params={"cursor": forged})
+        self.assertEqual(response.status_code, 400)
+
+    def test_limit_is_bounded(self):
+        task_id = self.client.post("/tasks/", json={"title": "Discuss", "priority": "Low"}).json()["_id"]
+        for path in ("comments", "history"):
+            for limit in (0, -1):
+                response = self.client.get(f"/tasks/{task_id}/{path}", params={"limit": limit})
+                self.assertEqual(response.status_code, 422)
+            with patch("app.routers.task.settings.TASK_PAGE_MAX_LIMIT", 10):
+                response = self.client.get(f"/tasks/{task_id}/{path}", params={"limit": 11})
+            self.assertEqual(response.status_code, 400)
+
+    def test_comments_of_other_users_task_are_forbidden(self):
+        task = {"title": "Private", "priority": "Low", "status": "Pending",
+                "created_by": ObjectId(), "assigned_to": ObjectId()}
+        task_id = self.client.portal.call(mongodb.db["tasks"].insert_one, task).inserted_id
+        self.assertEqual(self.client.get(f"/tasks/{task_id}/comments").status_code, 403)
+
+class TestCommentsMigration(unittest.TestCase):
+
+    def test_moves_embedded_comments(self):
+        db = AsyncMongoMockClient()["test_comments_migration"]
+        start = datetime(2024, 1, 1)
+        comments = [
+            {"user_id": ObjectId(), "content": f"comment {i}", "timestamp": start + timedelta(minutes=i)}
+            for i in range(3)
+        ]
+        migrated = {"_id": ObjectId(), "title": "Migrated", "comments": [], "comment_count": 0}
+
+        async def run():
+            task_id = (await db["tasks"].insert_one({"title": "Old", "comments": comments})).inserted_id
+            await db["tasks"].insert_one(migrated)
+            # Left behind by an interrupted earlier run
+            await db["comments"].insert_one({"task_id": task_id, **comments[0]})
+            count = await MIGRATIONS["task-comments"](db)
+            rerun = await MIGRATIONS["task-comments"](db)
+            stored = await db["comments"].find({"task_id": task_id}).sort("timestamp", 1).to_list(None)
+            return count, rerun, await db["tasks"].find_one({"_id": task_id}), stored
+
+        with patch("app.db.migrations.settings.TASK_LATEST_COMMENTS", 2):
+            count, rerun, task, stored = asyncio.run(run())
+        self.assertEqual((count, rerun), (1, 0))
+        self.assertEqual(task["comment_count"], 3)
+        self.assertEqual([comment["content"] for comment in task["comments"]], ["comment 1", "comment 2"])
+        self.assertEqual([comment["content"] for comment in stored], ["comment 0", "comment 1", "comment 2"])
+
+if __name__ == "__main__":
+    unittest.main()
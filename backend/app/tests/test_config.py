@@ -1,7 +1,12 @@
 # app/tests/test_config.py
 
+import subprocess
+import sys
 import unittest
-from app.core.config import settings
+from pathlib import Path
+from unittest.mock import patch
+from pydantic import ValidationError
+from app.core.config import EmailSettings, Settings, settings
 
 class TestConfig(unittest.TestCase):
 
@@ -10,5 +15,37 @@ class TestConfig(unittest.TestCase):
         self.assertIsNotNone(settings.MONGODB_URI)
         self.assertIsNotNone(settings.JWT_SECRET_KEY)
 
+    def test_email_settings_optional(self):
+        env = {"MONGODB_URI": "mongodb://localhost:27017", "JWT_SECRET_KEY": "secret"}
+        with patch.dict("os.environ", env, clear=True):
+            self.assertEqual(Settings(_env_file=None).JWT_SECRET_KEY, "secret")
+            self.assertFalse(EmailSettings(_env_file=None).enabled)
+
+    def test_rate_limits_validated_at_load(self):
+        env = {"MONGODB_URI": "mongodb://localhost:27017", "JWT_SECRET_KEY": "secret"}
+        with patch.dict("os.environ", env, clear=True):
+            self.assertEqual(Settings(_env_file=None, RATE_LIMIT_READ_PER_IP="5/1").RATE_LIMIT_READ_PER_IP, "5/1")
+            self.assertEqual(Settings(_env_file=None, RATE_LIMIT_READ_PER_IP="").RATE_LIMIT_READ_PER_IP, "")
+            for value in ("100/0", "0/60", "100 per minute", "100"):
+                with self.assertRaises(ValidationError):
+                    Settings(_env_file=None, RATE_LIMIT_WRITE_PER_IP=value)
+
+    def test_settings_patchable_through_proxy(self):
+        with patch.object(settings, "APP_NAME", "patched"):
+            self.assertEqual(settings.APP_NAME, "patched")
+        self.assertNotEqual(settings.APP_NAME, "patched")
+
+    def test_import_does_not_load_settings(self):
+        code = (
+            "import app.main\n"
+            "from app.core.config import get_settings\n"
+            "print(get_settings.cache_info().misses)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parents[2], capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "0")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,60 @@
+# app/tests/test_export.py
+
+import asyncio
+import csv
+import io
+import json
+import unittest
+from datetime import datetime
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core.auth import get_current_user
+from app.core.search import search_fields
+from app.db.connection import mongodb
+from app.models.user import UserResponseModel
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        mongodb.db = AsyncMongoMockClient()["test_export"]
+        self.user = UserResponseModel(_id=ObjectId(), email="user@example.com", roles=["user"])
+        other = ObjectId()
+        now = datetime.utcnow()
+        asyncio.run(mongodb.db["tasks"].insert_many([
+            {"title": f"Task {n}", "description": None, "priority": "Low", "status": "Pending",
+             "assigned_to": self.user.id if n % 2 else other, "created_by": other,
+             "comments": [], "comment_count": 0, "created_at": now, "updated_at": now,
+             **search_fields(f"Task {n}", None)}
+            for n in range(10)
+        ]))
+        app.dependency_overrides[get_current_user] = lambda: self.user
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        mongodb.db = self.previous_db
+
+    def test_ndjson_export_applies_role_filter(self):
+        response = self.client.get("/tasks/export")
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(all(row["assigned_to"] == str(self.user.id) for row in rows))
+        self.assertNotIn("search_terms", rows[0])
+
+    def test_gzip_csv_export(self):
+        response = self.client.get("/tasks/export", params={"format": "csv", "gzip": "true"})
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["assigned_to"], str(self.user.id))
+
+    def test_invalid_format(self):
+        self.assertEqual(self.client.get("/activities/export", params={"format": "xml"}).status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# app/tests/test_http_cache.py
+
+import unittest
+from unittest.mock import patch
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core import http_cache
+from app.core.auth import get_current_user
+from app.db.connection import mongodb
+from app.models.user import UserResponseModel
+from app.tests.test_write_ops import CountingDatabase
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        self.db = CountingDatabase(AsyncMongoMockClient()["test_http_cache"])
+        mongodb.db = self.db
+        self.manager = UserResponseModel(_id=ObjectId(), email="manager@example.com", roles=["manager"])
+        app.dependency_overrides[get_current_user] = lambda: self.manager
+        settings_patch = patch.multiple(
+            "app.core.config.settings", COLLECTION_VERSIONS=True, RESPONSE_CACHE_BACKEND="memory"
+        )
+        settings_patch.start()
+        self.addCleanup(settings_patch.stop)
+        http_cache._backend = None
+        self.client = TestClient(app)
+        self.task = self.client.post("/tasks/", json={"title": "Report", "priority": "High"}).json()
+
+    def tearDown(self):
+        http_cache._backend = None
+        app.dependency_overrides.clear()
+        mongodb.db = self.previous_db
+
+    def test_list_etag_and_cache(self):
+        first = self.client.get("/tasks/", params={"limit": 10})
+        etag = first.headers["etag"]
+        self.db.ops.clear()
+        cached = self.client.get("/tasks/", params={"limit": 10})
+        self.assertEqual(cached.json(), first.json())
+        self.assertEqual(self.db.ops, [("collection_versions", "find_one")])
+        not_modified = self.client.get("/tasks/", params={"limit": 10}, headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+
+        self.client.put(f"/tasks/{self.task['_id']}", json={"status": "Completed"})
+        changed = self.client.get("/tasks/", params={"limit": 10}, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()[0]["status"], "Completed")
+        self.assertNotEqual(changed.headers["etag"], etag)
+
+    def test_lists_ignore_lagging_secondary(self):
+        # A secondary that has not replicated the task yet
+        stale = AsyncMongoMockClient()["test_http_cache_secondary"]
+        with patch.object(mongodb, "secondary_db", stale):
+            tasks = self.client.get("/tasks/", params={"limit": 10}).json()
+            activities = self.client.get("/activities/")
+        self.assertEqual([task["_id"] for task in tasks], [self.task["_id"]])
+        self.assertEqual(activities.status_code, 200)
+        self.assertEqual(self.db.ops.count(("activities", "find")), 1)
+
+    def test_document_etag(self):
+        response = self.client.get(f"/tasks/{self.task['_id']}")
+        etag = response.headers["etag"]
+        response = self.client.get(f"/tasks/{self.task['_id']}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.client.post(f"/tasks/{self.task['_id']}/comments", json={"user_id": str(self.manager.id), "content": "hi"})
+        response = self.client.get(f"/tasks/{self.task['_id']}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_incomplete_backend_fails_on_construction(self):
+        class GetOnly(http_cache.ResponseCacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+# app/tests/test_indexes.py
+
+import unittest
+from app.db.indexes import QUERY_SHAPES, coverage_entry, plan_stages
+from app.models.indexes import INDEXES
+
+class TestIndexes(unittest.TestCase):
+
+    def test_email_index_is_unique(self):
+        email_indexes = [
+            index.document for index in INDEXES["users"]
+            if list(index.document["key"].keys()) == ["email"]
+        ]
+        self.assertTrue(email_indexes and email_indexes[0]["unique"])
+
+    def test_plan_stages_walks_sharded_plans(self):
+        plan = {
+            "stage": "SHARD_MERGE",
+            "shards": [
+                {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}},
+                {"winningPlan": {"stage": "COLLSCAN"}},
+            ],
+        }
+        self.assertEqual(plan_stages(plan), ["SHARD_MERGE", "FETCH", "IXSCAN", "COLLSCAN"])
+
+    def test_coverage_entry_flags_collscan(self):
+        shape = QUERY_SHAPES[0]
+        explain = {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+        self.assertFalse(coverage_entry(shape, explain)["indexed"])
+        explain = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}
+        self.assertTrue(coverage_entry(shape, explain)["indexed"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# app/tests/test_instrumentation.py
+
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.instrumentation import phase_duration, timed
+from app.core.metrics import Counter, Histogram, render_prometheus
+from app.main import app
+
+class TestInstrumentation(unittest.TestCase):
+    def test_render_prometheus_histogram(self):
+        hist = Histogram("test_render_seconds", "Test", labelnames=("route",), buckets=(0.1, 1.0))
+        hist.observe(0.5, route="/x")
+        with patch("app.core.metrics.registry", [hist, Counter("test_total", "Test")]):
+            text = render_prometheus()
+        self.assertIn("# TYPE test_render_seconds histogram", text)
+        self.assertIn('test_render_seconds_bucket{route="/x",le="0.1"} 0', text)
+        self.assertIn('test_render_seconds_bucket{route="/x",le="1.0"} 1', text)
+        self.assertIn('test_render_seconds_bucket{route="/x",le="+Inf"} 1', text)
+        self.assertIn('test_render_seconds_count{route="/x"} 1', text)
+        self.assertIn("# TYPE test_total counter", text)
+
+    def test_timed_outside_request(self):
+        with timed("unit"):
+            pass
+        self.assertIn(("none", "unit"), phase_duration.snapshot())
+
+    def test_metrics_endpoint_and_server_timing(self):
+        client = TestClient(app)
+        with patch("app.core.instrumentation.settings.DEBUG", True):
+            response = client.get("/")
+        self.assertIn("total;dur=", response.headers["server-timing"])
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/",status="200"}', response.text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# app/tests/test_lifecycle.py
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.core.lifecycle import LifecycleState, state
+from app.main import app
+
+class TestLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.addCleanup(setattr, state, "ready", state.ready)
+        self.addCleanup(setattr, state, "draining", state.draining)
+
+    def test_healthz(self):
+        response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_readyz(self):
+        state.ready, state.draining = False, False
+        self.assertEqual(self.client.get("/readyz").status_code, 503)
+
+        state.ready = True
+        with patch("app.routers.health.ping_mongo", AsyncMock(return_value=True)):
+            self.assertEqual(self.client.get("/readyz").status_code, 200)
+            state.draining = True
+            self.assertEqual(self.client.get("/readyz").status_code, 503)
+
+        state.draining = False
+        with patch("app.routers.health.ping_mongo", AsyncMock(return_value=False)):
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["mongodb"])
+
+    def test_drain_runs_callbacks_once(self):
+        lifecycle = LifecycleState()
+        callback = AsyncMock()
+        lifecycle.on_drain(callback)
+
+        async def drain():
+            await lifecycle.begin_drain()
+            await lifecycle.begin_drain()
+            return await lifecycle.wait_idle(0.1)
+
+        self.assertTrue(asyncio.run(drain()))
+        self.assertTrue(lifecycle.draining)
+        callback.assert_awaited_once()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# app/tests/test_rate_limit.py
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core import rate_limit
+from app.core.rate_limit import MemoryRateLimitBackend, parse_limit, route_group
+from app.core.security import create_access_token
+from app.db.connection import mongodb
+
+class TestRateLimit(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        mongodb.db = AsyncMongoMockClient()["test_rate_limit"]
+        # A fresh memory backend per test
+        patcher = patch.object(rate_limit, "_backend", MemoryRateLimitBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        mongodb.db = self.previous_db
+
+    def test_parse_limit_and_route_group(self):
+        self.assertEqual(parse_limit("10/60"), (10.0, 10 / 60))
+        self.assertIsNone(parse_limit(""))
+        self.assertEqual(route_group("POST", "/auth/login"), "auth")
+        self.assertEqual(route_group("POST", "/users/register"), "auth")
+        self.assertEqual(route_group("DELETE", "/tasks/abc"), "write")
+        self.assertEqual(route_group("GET", "/tasks/"), "read")
+        self.assertIsNone(route_group("GET", "/readyz"))
+
+    def test_bucket_refills(self):
+        backend = MemoryRateLimitBackend()
+
+        async def takes():
+            first = [(await backend.take([("k", 2, 1000)]))[0] for _ in range(3)]
+            await asyncio.sleep(0.01)
+            return first, (await backend.take([("k", 2, 1000)]))[0]
+
+        first, after_refill = asyncio.run(takes())
+        self.assertEqual(first[:2], [0.0, 0.0])
+        self.assertGreater(first[2], 0)
+        self.assertEqual(after_refill, 0.0)
+
+    def test_rejected_request_spends_no_bucket(self):
+        backend = MemoryRateLimitBackend()
+
+        async def takes():
+            await backend.take([("user", 1, 0.001)])
+            rejected = await backend.take([("ip", 1, 0.001), ("user", 1, 0.001)])
+            return rejected, await backend.take([("ip", 1, 0.001)])
+
+        rejected, ip_only = asyncio.run(takes())
+        self.assertEqual(rejected[0], 0.0)
+        self.assertGreater(rejected[1], 0)
+        # The per-user rejection left the IP token in place
+        self.assertEqual(ip_only, [0.0])
+
+    def test_incomplete_backend_fails_on_construction(self):
+        with self.assertRaises(TypeError):
+            rate_limit.RateLimitBackend()
+
+    def test_login_limited_per_ip(self):
+        form = {"username": "nobody@example.com", "password": "wrong"}
+        with patch.object(rate_limit.settings, "RATE_LIMIT_AUTH_PER_IP", "2/60"):
+            statuses = [self.client.post("/auth/login", data=form).status_code for _ in range(2)]
+            response = self.client.post("/auth/login", data=form)
+            self.assertEqual(self.client.get("/healthz").status_code, 200)
+        self.assertEqual(statuses, [400, 400])
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "30")
+
+    def test_writes_limited_per_token_subject(self):
+        first = {"Authorization": f"Bearer {create_access_token('5f1d7c2e9b1e8a3d4c6b7a80')}"}
+        second = {"Authorization": f"Bearer {create_access_token('5f1d7c2e9b1e8a3d4c6b7a81')}"}
+        with patch.multiple(rate_limit.settings, RATE_LIMIT_WRITE_PER_IP="", RATE_LIMIT_WRITE_PER_USER="1/60"):
+            self.assertNotEqual(self.client.delete("/tasks/x", headers=first).status_code, 429)
+            self.assertEqual(self.client.delete("/tasks/x", headers=first).status_code, 429)
+            self.assertNotEqual(self.client.delete("/tasks/x", headers=second).status_code, 429)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# app/tests/test_responses.py
+
+import unittest
+from datetime import datetime
+import orjson
+from bson import ObjectId
+from app.core.responses import MongoJSONResponse, trusted_rows
+from app.models.task import TaskResponseModel
+
+class TestResponses(unittest.TestCase):
+
+    def setUp(self):
+        user_id = ObjectId()
+        self.doc = {
+            "_id": ObjectId(),
+            "title": "Write report",
+            "priority": "High",
+            "status": "Pending",
+            "created_by": user_id,
+            "assigned_to": user_id,
+            "comments": [
+                {"user_id": user_id, "content": "Soon", "timestamp": datetime(2024, 5, 1, 8, 30, 0, 123000)},
+            ],
+            "created_at": datetime(2024, 5, 1, 8, 0),
+            "updated_at": datetime(2024, 5, 1, 9, 0, 0, 5000),
+            "search_terms": ["wr", "wri"],
+        }
+
+    def render(self, rows):
+        return orjson.loads(MongoJSONResponse(rows).body)
+
+    def test_trusted_rows_match_validated_output(self):
+        validated = TaskResponseModel(**self.doc).model_dump(mode="json", by_alias=True)
+        self.assertEqual(self.render(trusted_rows(TaskResponseModel, [self.doc])), [validated])
+
+    def test_trusted_rows_with_fields(self):
+        rows = self.render(trusted_rows(TaskResponseModel, [self.doc], ["title", "description"]))
+        self.assertEqual(rows, [{"_id": str(self.doc["_id"]), "title": "Write report", "description": None}])
+
+    def test_row_missing_required_field_is_validated(self):
+        del self.doc["title"]
+        with self.assertRaises(ValueError):
+            trusted_rows(TaskResponseModel, [self.doc])
+
+if __name__ == '__main__':
+    unittest.main()
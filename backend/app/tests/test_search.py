@@ -0,0 +1,48 @@
+# app/tests/test_search.py
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.search import tokenize, search_fields, query_terms, relevance_pipeline
+
+class TestSearch(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Weekly REPORT, weekly (draft) a"), ["weekly", "report", "draft"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_search_fields_index_prefixes(self):
+        fields = search_fields("Quarterly report", "Send to finance")
+        for term in ["qu", "quarterly", "re", "report", "fin", "finance", "send"]:
+            self.assertIn(term, fields["search_terms"])
+        self.assertEqual(fields["search_title"], ["quarterly", "report"])
+
+    def test_query_terms_are_plain_tokens(self):
+        # User input never reaches Mongo as a regex
+        self.assertEqual(query_terms(".*(a+)+$ Report"), ["report"])
+
+    def test_relevance_ranks_only_newest_candidates(self):
+        db = AsyncMongoMockClient()["test_search"]
+        start = datetime(2024, 1, 1)
+        # The oldest task has the best title match but is past the candidate cap
+        titles = ["Report", "Reporting draft", "Reporting notes", "Reporting plan", "Reporting review"]
+        tasks = [
+            {"title": title, "updated_at": start + timedelta(days=n), **search_fields(title, None)}
+            for n, title in enumerate(titles)
+        ]
+
+        async def run():
+            await db["tasks"].insert_many(tasks)
+            # mongomock has no $unset, so the test passes a projection
+            pipeline = relevance_pipeline(
+                {"search_terms": {"$all": ["report"]}}, ["report"], 0, 2, {"title": 1}, candidates=3
+            )
+            return await db["tasks"].aggregate(pipeline).to_list(None)
+
+        results = asyncio.run(run())
+        self.assertEqual([task["title"] for task in results], ["Reporting review", "Reporting plan"])
+
+if __name__ == '__main__':
+    unittest.main()
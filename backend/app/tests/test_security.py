@@ -1,7 +1,18 @@
 # app/tests/test_security.py
 
+import asyncio
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from app.core.hashing import PasswordHasher
 from app.core.security import get_password_hash, verify_password, create_access_token, decode_access_token
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.security import public_jwks, signing_keys, token_cache
 
 class TestSecurity(unittest.TestCase):
 
@@ -10,11 +21,59 @@ class TestSecurity(unittest.TestCase):
         hashed = get_password_hash(password)
         self.assertTrue(verify_password(password, hashed))
 
+    def test_password_hashing_async(self):
+        password = "mysecretpassword"
+        hashed = asyncio.run(get_password_hash_async(password))
+        self.assertTrue(asyncio.run(verify_password_async(password, hashed)))
+
+    def test_hasher_rejects_when_queue_is_full(self):
+        hasher = PasswordHasher(pool_size=1, queue_limit=0)
+        hasher.pending = 1
+        with self.assertRaises(HTTPException) as ctx:
+            asyncio.run(hasher.run("hash", get_password_hash, "password"))
+        self.assertEqual(ctx.exception.status_code, 429)
+
     def test_jwt_token(self):
         user_id = "user123"
         token = create_access_token(user_id)
         decoded_user_id = decode_access_token(token)
         self.assertEqual(user_id, decoded_user_id)
 
+    def test_verified_token_cache(self):
+        token = create_access_token("user123")
+        token_cache().clear()
+        first = decode_access_token(token)
+        with patch("jose.jwt.decode", side_effect=AssertionError("not cached")):
+            second = decode_access_token(token)
+        self.assertEqual(first, second)
+        self.assertIsNone(decode_access_token(token[:-2] + "xx"))
+
+    def test_rs256_tokens_and_jwks(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        with tempfile.TemporaryDirectory() as tmp:
+            private_path, public_path = Path(tmp, "private.pem"), Path(tmp, "public.pem")
+            private_path.write_bytes(key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            ))
+            public_path.write_bytes(key.public_key().public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+            ))
+            overrides = {
+                "JWT_ALGORITHM": "RS256",
+                "JWT_PRIVATE_KEY_PATH": str(private_path),
+                "JWT_PUBLIC_KEY_PATH": str(public_path),
+            }
+            signing_keys.cache_clear()
+            try:
+                with patch.multiple("app.core.security.settings", **overrides):
+                    token = create_access_token("user123")
+                    self.assertEqual(decode_access_token(token)["sub"], "user123")
+                    jwks = public_jwks()
+            finally:
+                signing_keys.cache_clear()
+        self.assertEqual(jwks["keys"][0]["kty"], "RSA")
+        self.assertEqual(jwks["keys"][0]["kid"], "default")
+        self.assertNotIn("d", jwks["keys"][0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+# app/tests/test_task_import.py
+
+import asyncio
+import io
+import json
+import time
+import unittest
+from unittest.mock import patch
+from anyio.from_thread import start_blocking_portal
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core.auth import get_current_user
+from app.db.connection import mongodb
+from app.db.task_import import new_import_job, run_import
+from app.models.user import UserResponseModel
+
+class TestTaskImport(unittest.TestCase):
+
+    def setUp(self):
+        self.previous_db = mongodb.db
+        mongodb.db = AsyncMongoMockClient()["test_task_import"]
+        self.manager = UserResponseModel(_id=ObjectId(), email="manager@example.com", roles=["manager"])
+        app.dependency_overrides[get_current_user] = lambda: self.manager
+        self.client = TestClient(app)
+        # One event loop for all requests, so background imports keep running
+        self.client.portal = self.enterContext(start_blocking_portal())
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        mongodb.db = self.previous_db
+
+    def test_ndjson_import_reports_invalid_rows(self):
+        lines = [json.dumps({"title": f"Task {n}", "priority": "Low"}) for n in range(3)]
+        lines.insert(1, json.dumps({"title": "No priority"}))
+        lines.insert(2, "not json")
+        response = self.client.post(
+            "/tasks/import", files={"file": ("tasks.ndjson", "\n".join(lines).encode())}
+        )
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual((report["status"], report["total"], report["inserted"], report["failed"]),
+                         ("completed", 5, 3, 2))
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        task = asyncio.run(mongodb.db["tasks"].find_one({"title": "Task 0"}))
+        self.assertEqual(task["created_by"], self.manager.id)
+        self.assertIn("search_terms", task)
+
+    def test_background_csv_import_and_status(self):
+        body = "title,priority,description\nFirst,High,\nSecond,Medium,Details\n"
+        response = self.client.post(
+            "/tasks/import", params={"background": "true"}, files={"file": ("tasks.csv", body.encode())}
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["_id"]
+        for _ in range(50):
+            job = self.client.get(f"/tasks/import/{job_id}").json()
+            if job["status"] == "completed":
+                break
+            time.sleep(0.05)
+        self.assertEqual((job["status"], job["format"], job["inserted"]), ("completed", "csv", 2))
+
+    def _job(self, job_id):
+        return self.client.portal.call(mongodb.db["import_jobs"].find_one, {"_id": ObjectId(job_id)})
+
+    def test_interrupted_import_is_marked_failed(self):
+        async def interrupted():
+            job = await new_import_job(mongodb.db, self.manager.id, "tasks.ndjson", "ndjson")
+            stream = io.BytesIO(json.dumps({"title": "Task", "priority": "Low"}).encode())
+
+            def build_document(task):
+                # Same as the task being cancelled during the first chunk
+                raise asyncio.CancelledError
+
+            with self.assertRaises(asyncio.CancelledError):
+                await run_import(mongodb.db, job, stream, build_document)
+            return job["_id"]
+
+        job = self._job(self.client.portal.call(interrupted))
+        self.assertEqual(job["status"], "failed")
+        self.assertIsNotNone(job["finished_at"])
+        self.assertEqual(job["errors"], [{"row": 1, "detail": "Import interrupted"}])
+
+    def test_decode_error_respects_error_cap(self):
+        with patch("app.db.task_import.settings.TASK_IMPORT_MAX_ERRORS", 0):
+            response = self.client.post("/tasks/import", files={"file": ("tasks.ndjson", b"\xff\xfe\xfa")})
+        report = response.json()
+        self.assertEqual((report["status"], report["errors"]), ("failed", []))
+        self.assertEqual(self._job(report["_id"])["errors"], [])
+
+if __name__ == '__main__':
+    unittest.main()
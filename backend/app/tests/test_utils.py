@@ -1,7 +1,8 @@
 # app/tests/test_utils.py
 
 import unittest
-from app.core.utils import is_valid_object_id, get_object_id
+from datetime import datetime
+from app.core.utils import is_valid_object_id, get_object_id, encode_cursor, decode_cursor
 from bson.objectid import ObjectId
 
 class TestUtils(unittest.TestCase):
@@ -19,5 +20,26 @@ class TestUtils(unittest.TestCase):
         self.assertIsInstance(obj_id, ObjectId)
         self.assertEqual(str(obj_id), id_str)
 
+    def test_cursor_round_trip(self):
+        data = {
+            "v": datetime(2024, 1, 2, 3, 4, 5, 6000),
+            "id": ObjectId("507f1f77bcf86cd799439011"),
+        }
+        self.assertEqual(decode_cursor(encode_cursor(data)), data)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+        forged = [
+            {"v": {"$regex": "."}, "id": ObjectId("507f1f77bcf86cd799439011")},
+            {"v": ["a"], "id": ObjectId("507f1f77bcf86cd799439011")},
+            {"v": "a", "id": {"$gt": ""}},
+            {"v": "a"},
+            {"id": ObjectId("507f1f77bcf86cd799439011")},
+        ]
+        for data in forged:
+            with self.assertRaises(ValueError):
+                decode_cursor(encode_cursor(data))
+
 if __name__ == '__main__':
     unittest.main()
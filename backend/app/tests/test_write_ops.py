@@ -0,0 +1,238 @@
+# app/tests/test_write_ops.py
+
+import asyncio
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from bson import ObjectId
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+
+from app.main import app
+from app.core.auth import get_current_user
+from app.core.search import search_fields
+from app.db.connection import mongodb
+from app.models.user import UserResponseModel
+
+COUNTED_OPS = {
+    "find", "find_one", "aggregate", "count_documents",
+    "insert_one", "insert_many", "update_one", "update_many", "bulk_write",
+    "delete_one", "delete_many", "find_one_and_update", "find_one_and_delete",
+}
+
+class CountingCollection:
+    # Records every Mongo operation an endpoint issues
+    def __init__(self, collection, ops):
+        self._collection = collection
+        self._ops = ops
+
+    def __getattr__(self, name):
+        attr = getattr(self._collection, name)
+        if name not in COUNTED_OPS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self._ops.append((self._collection.name, name))
+            return attr(*args, **kwargs)
+        return counted
+
+class CountingDatabase:
+    def __init__(self, db):
+        self._db = db
+        self.ops = []
+
+    def __getitem__(self, name):
+        return CountingCollection(self._db[name], self.ops)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+class TestWriteOps(unittest.TestCase):
+
+    def setUp(self):
+        self.db = CountingDatabase(AsyncMongoMockClient()["test_write_ops"])
+        self.previous_db = mongodb.db
+        mongodb.db = self.db
+        self.manager = UserResponseModel(_id=ObjectId(), email="manager@example.com", roles=["manager"])
+        self.admin = UserResponseModel(_id=ObjectId(), email="admin@example.com", roles=["admin"])
+        self.current_user = self.manager
+        app.dependency_overrides[get_current_user] = lambda: self.current_user
+        self.client = TestClient(app)
+
+        now = datetime.utcnow()
+        self.task_id = self.insert("tasks", {
+            "title": "Write report",
+            "description": "Quarterly numbers",
+            "priority": "High",
+            "status": "Pending",
+            "created_by": self.manager.id,
+            "assigned_to": self.manager.id,
+            "comments": [],
+            "created_at": now,
+            "updated_at": now,
+        })
+        self.activity_id = self.insert("activities", {
+            "activity_name": "Sprint",
+            "tasks": [ObjectId(self.task_id)],
+            "manager_id": self.manager.id,
+            "created_at": now,
+            "updated_at": now,
+        })
+        self.user_id = self.insert("users", {
+            "email": "user@example.com",
+            "password_hash": "x",
+            "roles": ["user"],
+        })
+        self.db.ops.clear()
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        mongodb.db = self.previous_db
+
+    def insert(self, collection, document):
+        result = asyncio.run(self.db._db[collection].insert_one(document))
+        return str(result.inserted_id)
+
+    def assertOps(self, expected):
+        self.assertEqual(self.db.ops, expected)
+
+    def test_update_task_single_op(self):
+        response = self.client.put(f"/tasks/{self.task_id}", json={"status": "Completed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "Completed")
+        self.assertOps([("tasks", "find_one_and_update")])
+
+    def test_update_task_both_text_fields_single_op(self):
+        response = self.client.put(
+            f"/tasks/{self.task_id}", json={"title": "New", "description": "Text"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertOps([("tasks", "find_one_and_update")])
+
+    def test_update_task_one_text_field_single_write(self):
+        response = self.client.put(f"/tasks/{self.task_id}", json={"title": "Write summary"})
+        self.assertEqual(response.status_code, 200)
+        self.assertOps([("tasks", "find_one"), ("tasks", "find_one_and_update")])
+        task = self.db._db.delegate["tasks"].find_one({"_id": ObjectId(self.task_id)})
+        self.assertIn("summary", task["search_terms"])
+        self.assertIn("quarterly", task["search_terms"])
+
+    def test_update_task_one_text_field_concurrent_edit(self):
+        stored = self.db._db.delegate["tasks"]
+        edited = []
+
+        def concurrent_edit(title, description):
+            # Another request changes the description between the read and the write
+            if not edited:
+                edited.append(True)
+                stored.update_one({"_id": ObjectId(self.task_id)}, {"$set": {"description": "Annual totals"}})
+            return search_fields(title, description)
+
+        with patch("app.routers.task.search_fields", side_effect=concurrent_edit):
+            response = self.client.put(f"/tasks/{self.task_id}", json={"title": "Write summary"})
+        self.assertEqual(response.status_code, 200)
+        task = stored.find_one({"_id": ObjectId(self.task_id)})
+        self.assertEqual(task["description"], "Annual totals")
+        self.assertIn("annual", task["search_terms"])
+        self.assertNotIn("quarterly", task["search_terms"])
+
+    def test_update_task_not_visible(self):
+        self.current_user = UserResponseModel(_id=ObjectId(), email="other@example.com", roles=["user"])
+        response = self.client.put(f"/tasks/{self.task_id}", json={"status": "Completed"})
+        self.assertEqual(response.status_code, 403)
+
+    def test_update_task_missing(self):
+        response = self.client.put(f"/tasks/{ObjectId()}", json={"status": "Completed"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_add_comment_single_op(self):
+        response = self.client.post(
+            f"/tasks/{self.task_id}/comments",
+            json={"user_id": str(self.manager.id), "content": "Done soon"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["comments"]), 1)
+        self.assertEqual(response.json()["comment_count"], 1)
+        self.assertOps([("tasks", "find_one_and_update"), ("comments", "insert_one")])
+
+    def test_delete_task_single_op(self):
+        response = self.client.delete(f"/tasks/{self.task_id}")
+        self.assertEqual(response.status_code, 204)
+        self.assertOps([("tasks", "find_one_and_delete"), ("comments", "delete_many")])
+
+    def test_delete_task_of_other_manager(self):
+        # Managers may only delete tasks they created or are assigned to
+        self.current_user = UserResponseModel(_id=ObjectId(), email="other@example.com", roles=["manager"])
+        response = self.client.delete(f"/tasks/{self.task_id}")
+        self.assertEqual(response.status_code, 403)
+        self.assertIsNotNone(self.db._db.delegate["tasks"].find_one({"_id": ObjectId(self.task_id)}))
+
+    def test_bulk_create_single_op(self):
+        items = [
+            {"title": "One", "priority": "Low"},
+            {"title": "Two", "priority": "Urgent"},
+            {"title": "Three", "priority": "High"},
+        ]
+        response = self.client.post("/tasks/bulk?ordered=false", json=items)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["ids"]), 2)
+        self.assertEqual([error["index"] for error in response.json()["errors"]], [1])
+        self.assertOps([("tasks", "insert_many")])
+
+    def test_bulk_create_ordered_stops_at_first_error(self):
+        items = [
+            {"title": "One", "priority": "Low"},
+            {"title": "Two", "priority": "Urgent"},
+            {"title": "Three", "priority": "High"},
+        ]
+        response = self.client.post("/tasks/bulk", json=items)
+        self.assertEqual(len(response.json()["ids"]), 1)
+
+    def test_bulk_update_two_ops(self):
+        items = [
+            {"id": self.task_id, "status": "Completed"},
+            {"id": str(ObjectId()), "status": "Completed"},
+        ]
+        response = self.client.patch("/tasks/bulk?ordered=false", json=items)
+        self.assertEqual(response.json()["ids"], [self.task_id])
+        self.assertEqual(response.json()["errors"][0]["detail"], "Task not found")
+        self.assertOps([("tasks", "find"), ("tasks", "bulk_write")])
+
+    def test_bulk_delete_fixed_ops(self):
+        response = self.client.request(
+            "DELETE", "/tasks/bulk", json={"ids": [self.task_id, str(ObjectId())]}
+        )
+        self.assertEqual(response.json()["ids"], [self.task_id])
+        self.assertOps([("tasks", "find"), ("tasks", "delete_many"), ("comments", "delete_many")])
+
+    def test_update_activity_single_op(self):
+        response = self.client.put(f"/activities/{self.activity_id}", json={"tasks": []})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["tasks"], [])
+        self.assertOps([("activities", "find_one_and_update")])
+
+    def test_update_activity_of_other_manager(self):
+        self.current_user = UserResponseModel(_id=ObjectId(), email="other@example.com", roles=["manager"])
+        response = self.client.put(f"/activities/{self.activity_id}", json={"tasks": []})
+        self.assertEqual(response.status_code, 403)
+
+    def test_delete_activity_single_op(self):
+        response = self.client.delete(f"/activities/{self.activity_id}")
+        self.assertEqual(response.status_code, 204)
+        self.assertOps([("activities", "find_one_and_delete")])
+
+    def test_update_user_single_op(self):
+        self.current_user = self.admin
+        response = self.client.put(f"/users/{self.user_id}", json={"roles": ["manager"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["roles"], ["manager"])
+        self.assertOps([("users", "find_one_and_update")])
+
+    def test_delete_user_single_op(self):
+        self.current_user = self.admin
+        response = self.client.delete(f"/users/{self.user_id}")
+        self.assertEqual(response.status_code, 204)
+        self.assertOps([("users", "delete_one")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_import_time.py
+#
+# Cold-start import cost of the app, from `python -X importtime` in fresh
+# interpreters: median total, the slowest modules and the app's own modules.
+# Exits non-zero when the median total is over the tracked budget in
+# import_budget.json, so a heavy new top-level import shows up in review.
+#
+#   python -m benchmarks.bench_import_time
+#   python -m benchmarks.bench_import_time --module app.core.config --top 10
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_PATH = Path(__file__).parent / "import_budget.json"
+BACKEND_DIR = Path(__file__).parent.parent
+
+def import_profile(module: str) -> dict:
+    """{module: (self us, cumulative us)} for one fresh `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+def main(argv=None) -> int:
+    budgets = json.loads(BUDGET_PATH.read_text())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, help="default: import_budget.json")
+    args = parser.parse_args(argv)
+
+    # The first run also writes .pyc files; it is not measured
+    import_profile(args.module)
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals = [profile[args.module][1] / 1000 for profile in profiles]
+    total = statistics.median(totals)
+    last = profiles[-1]
+
+    print(f"{'module':<45} {'self ms':>9} {'cumulative ms':>14}")
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"{name:<45} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    print()
+    own = [(name, times) for name, times in last.items() if name.split(".")[0] == "app"]
+    for name, (self_us, cumulative_us) in sorted(own, key=lambda item: -item[1][1])[:args.top]:
+        print(f"{name:<45} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    print()
+    print(f"import {args.module}: median {total:.1f}ms, min {min(totals):.1f}ms over {args.runs} runs")
+
+    budget = args.budget_ms or budgets.get(args.module)
+    if budget is None:
+        print(f"No budget for {args.module}")
+        return 0
+    if total > budget:
+        print(f"OVER BUDGET: {total:.1f}ms > {budget:.1f}ms")
+        return 1
+    print(f"Within budget ({budget:.1f}ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# benchmarks/bench_list_serialization.py
+#
+# Per-request CPU spent turning Mongo rows into a response body for list
+# endpoints: validate + FastAPI response_model + JSONResponse, against
+# trusted rows rendered by MongoJSONResponse.
+#
+#   python -m benchmarks.bench_list_serialization
+
+import asyncio
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import MongoJSONResponse, trusted_rows
+from app.models.task import TaskResponseModel
+from benchmarks.bench_list_views import make_task
+
+PAGE_SIZES = (5, 100, 1000)
+REPEAT = 50
+
+FIELD = create_model_field(name="Response_get_tasks", type_=List[TaskResponseModel], mode="serialization")
+
+async def validated(docs) -> bytes:
+    models = [TaskResponseModel(**doc) for doc in docs]
+    content = await serialize_response(field=FIELD, response_content=models)
+    return JSONResponse(content).body
+
+async def fast(docs) -> bytes:
+    return MongoJSONResponse(trusted_rows(TaskResponseModel, docs)).body
+
+async def timed(func, docs) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        await func(docs)
+    return (time.perf_counter() - start) / REPEAT
+
+async def main():
+    print(f"{'items':>6} {'validated ms':>13} {'fast ms':>9} {'saved ms':>9} {'speedup':>8}")
+    for size in PAGE_SIZES:
+        docs = [make_task(i) for i in range(size)]
+        for doc in docs:
+            doc.pop("search_terms")
+            doc.pop("search_title")
+        slow_s = await timed(validated, docs)
+        fast_s = await timed(fast, docs)
+        print(f"{size:>6} {slow_s * 1e3:>13.3f} {fast_s * 1e3:>9.3f} "
+              f"{(slow_s - fast_s) * 1e3:>9.3f} {slow_s / fast_s:>7.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
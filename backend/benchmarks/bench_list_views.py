@@ -0,0 +1,82 @@
+# benchmarks/bench_list_views.py
+#
+# Compares the full and summary views of GET /tasks: BSON bytes Mongo sends
+# per page and per-item validation + JSON serialization cost.
+#
+#   python -m benchmarks.bench_list_views
+
+import json
+import time
+from datetime import datetime
+
+import bson
+from bson import ObjectId
+from pydantic import TypeAdapter
+from typing import List
+
+from app.core.search import search_fields
+from app.core.utils import dump_summary
+from app.models.task import TaskResponseModel, TaskSummaryModel, TASK_SUMMARY_FIELDS
+
+PAGE_SIZES = (5, 100, 1000)
+REPEAT = 20
+
+def make_task(i: int) -> dict:
+    user_id = ObjectId()
+    now = datetime.utcnow()
+    title = f"Prepare weekly report {i}"
+    description = "Collect numbers from every team and summarise the open risks " * 3
+    return {
+        "_id": ObjectId(),
+        "title": title,
+        "description": description,
+        "priority": "High",
+        "status": "In Progress",
+        "created_by": user_id,
+        "assigned_to": user_id,
+        "comments": [
+            {"user_id": user_id, "content": f"Update number {n} on the report", "timestamp": now}
+            for n in range(5)
+        ],
+        "comment_count": 12,
+        "created_at": now,
+        "updated_at": now,
+        **search_fields(title, description),
+    }
+
+def project(doc: dict, fields) -> dict:
+    return {key: doc[key] for key in ("_id", *fields) if key in doc}
+
+def full_view(docs):
+    # What FastAPI does for response_model=List[TaskResponseModel]
+    models = [TaskResponseModel(**doc) for doc in docs]
+    adapter = TypeAdapter(List[TaskResponseModel])
+    return adapter.dump_json(adapter.validate_python(models), by_alias=True)
+
+def summary_view(docs):
+    # What the router returns through JSONResponse
+    return json.dumps(dump_summary(TaskSummaryModel, docs, TASK_SUMMARY_FIELDS)).encode()
+
+def timed(func, docs) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(docs)
+    return (time.perf_counter() - start) / REPEAT
+
+def main():
+    print(f"{'items':>6} {'view':>8} {'bson bytes':>12} {'json bytes':>12} {'us/item':>9}")
+    for size in PAGE_SIZES:
+        stored = [make_task(i) for i in range(size)]
+        full_docs = [{k: v for k, v in doc.items() if k not in ("search_terms", "search_title")} for doc in stored]
+        summary_docs = [project(doc, TASK_SUMMARY_FIELDS) for doc in stored]
+        for name, docs, func in (
+            ("full", full_docs, full_view),
+            ("summary", summary_docs, summary_view),
+        ):
+            wire = sum(len(bson.encode(doc)) for doc in docs)
+            body = len(func(docs))
+            per_item = timed(func, docs) / size * 1e6
+            print(f"{size:>6} {name:>8} {wire:>12} {body:>12} {per_item:>9.1f}")
+
+if __name__ == "__main__":
+    main()
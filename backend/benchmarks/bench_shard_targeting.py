@@ -0,0 +1,87 @@
+# benchmarks/bench_shard_targeting.py
+#
+# Targeted vs broadcast query latency on the docker-shard-db cluster.
+# Seeds a throwaway database, shards it with app/models/sharding.py and
+# compares query shapes whose filter does / does not carry the shard key.
+#
+#   docker-compose -f ../docker-shard-db/docker-compose.yml up -d
+#   MONGODB_URI=mongodb://localhost:27020 python -m benchmarks.bench_shard_targeting
+
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.db.sharding import setup_sharding
+
+DATABASE_NAME = "benchShardTargeting"
+MANAGERS = 200
+ACTIVITIES_PER_MANAGER = 20
+TASKS = 50_000
+SAMPLES = 300
+
+def shards_hit(explain: dict) -> int:
+    plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    return len(plan.get("shards", [])) or 1
+
+async def seed(db, managers):
+    now = datetime.utcnow()
+    await db["activities"].insert_many([
+        {"activity_name": f"a{i}", "tasks": [], "manager_id": manager, "created_at": now, "updated_at": now}
+        for manager in managers for i in range(ACTIVITIES_PER_MANAGER)
+    ])
+    for start in range(0, TASKS, 10_000):
+        await db["tasks"].insert_many([
+            {"title": f"t{n}", "priority": "Low", "status": "Pending",
+             "created_by": managers[n % len(managers)], "assigned_to": managers[n % len(managers)],
+             "created_at": now, "updated_at": now}
+            for n in range(start, min(start + 10_000, TASKS))
+        ])
+
+async def measure(db, collection, make_filter):
+    timings = []
+    for i in range(SAMPLES):
+        query = make_filter(i)
+        start = time.perf_counter()
+        await db[collection].find(query).to_list(length=100)
+        timings.append(time.perf_counter() - start)
+    explain = await db.command({"explain": {"find": collection, "filter": make_filter(0)}, "verbosity": "queryPlanner"})
+    timings.sort()
+    return {
+        "shards": shards_hit(explain),
+        "p50_ms": statistics.median(timings) * 1e3,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1e3,
+    }
+
+async def main():
+    client = AsyncIOMotorClient(os.environ.get("MONGODB_URI", "mongodb://localhost:27020"))
+    await client.drop_database(DATABASE_NAME)
+    db = client[DATABASE_NAME]
+    await setup_sharding(client, DATABASE_NAME)
+    managers = [ObjectId() for _ in range(MANAGERS)]
+    await seed(db, managers)
+    await db["tasks"].create_index([("assigned_to", 1)])
+    await db["tasks"].create_index([("created_by", 1)])
+    await db["activities"].create_index([("activity_name", 1)])
+    task_ids = [task["_id"] async for task in db["tasks"].find({}, {"_id": 1}).limit(SAMPLES)]
+
+    shapes = {
+        "activities by manager_id (targeted)": ("activities", lambda i: {"manager_id": managers[i % MANAGERS]}),
+        "activities by name (broadcast)": ("activities", lambda i: {"activity_name": f"a{i % ACTIVITIES_PER_MANAGER}"}),
+        "task by _id (targeted)": ("tasks", lambda i: {"_id": task_ids[i % len(task_ids)]}),
+        "tasks by owner $or (broadcast)": ("tasks", lambda i: {"$or": [
+            {"assigned_to": managers[i % MANAGERS]}, {"created_by": managers[i % MANAGERS]},
+        ]}),
+    }
+    print(f"{'query shape':<40} {'shards':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, (collection, make_filter) in shapes.items():
+        result = await measure(db, collection, make_filter)
+        print(f"{name:<40} {result['shards']:>6} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+    await client.drop_database(DATABASE_NAME)
+
+if __name__ == "__main__":
+    asyncio.run(main())
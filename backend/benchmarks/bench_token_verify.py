@@ -0,0 +1,64 @@
+# benchmarks/bench_token_verify.py
+#
+# Per-request token verification cost: jose.jwt.decode for HS256 / RS256 /
+# ES256 versus a hit in the verified-token cache used by decode_access_token.
+#
+#   python -m benchmarks.bench_token_verify
+
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+from jose import jwt
+
+from app.core import security
+
+REPEAT = 2000
+
+def write_keys(directory: str, private_key) -> dict:
+    private_path, public_path = Path(directory, "private.pem"), Path(directory, "public.pem")
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+    return {"JWT_PRIVATE_KEY_PATH": str(private_path), "JWT_PUBLIC_KEY_PATH": str(public_path)}
+
+def per_call_us(func, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+def measure(algorithm: str, overrides: dict):
+    security.signing_keys.cache_clear()
+    with patch.multiple(security.settings, JWT_ALGORITHM=algorithm, **overrides):
+        token = security.create_access_token("5f1d7c2e9b1e8a3d4c6b7a80")
+        verify_key = security.signing_keys()[1]
+        uncached = per_call_us(jwt.decode, token, verify_key, [algorithm])
+        security.token_cache().clear()
+        security.decode_access_token(token)
+        cached = per_call_us(security.decode_access_token, token)
+    security.signing_keys.cache_clear()
+    return uncached, cached
+
+def main():
+    print(f"{'algorithm':<10} {'jose decode us':>15} {'cache hit us':>13} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = {
+            "HS256": {},
+            "RS256": write_keys(tmp, rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+        }
+        with tempfile.TemporaryDirectory() as tmp_ec:
+            cases["ES256"] = write_keys(tmp_ec, ec.generate_private_key(ec.SECP256R1()))
+            for algorithm, overrides in cases.items():
+                uncached, cached = measure(algorithm, overrides)
+                print(f"{algorithm:<10} {uncached:>15.1f} {cached:>13.1f} {uncached / cached:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
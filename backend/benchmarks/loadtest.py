@@ -0,0 +1,359 @@
+# benchmarks/loadtest.py
+#
+# End-to-end load test: seeds users/tasks/activities into a local mongod and
+# drives a weighted mix of login, list, search, create, comment and update
+# requests, either in-process (httpx ASGITransport) or against a real uvicorn
+# process. Reports p50/p95/p99 and req/s per endpoint and can save / compare
+# baselines so regressions show up.
+#
+#   python -m benchmarks.loadtest --tasks 10000 --mode asgi
+#   python -m benchmarks.loadtest --tasks 1000000 --mode uvicorn --save-baseline
+#   python -m benchmarks.loadtest --tasks 1000000 --mode uvicorn --compare
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from motor.motor_asyncio import AsyncIOMotorClient
+
+DATABASE_NAME = "benchLoadtest"
+PASSWORD = "loadtest-password"
+SEED_BATCH = 10_000
+BASELINE_DIR = Path(__file__).parent / "baselines"
+DEFAULT_MIX = "login=2,list=40,search=15,get=10,create=13,comment=10,update=10"
+WORDS = (
+    "report budget release review deploy invoice design meeting roadmap audit "
+    "backup migration onboarding hiring survey launch refactor incident"
+).split()
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation in --mix: {name}")
+        weights[name.strip()] = int(weight)
+    return weights
+
+def percentile(sorted_values, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+# ---------------------------------------------------------------- seeding
+
+def make_seed_task(n: int, users) -> dict:
+    from app.core.search import search_fields
+
+    owner = users[n % len(users)]
+    assignee = users[(n * 7) % len(users)]
+    title = f"{random.choice(WORDS)} {random.choice(WORDS)} {n}"
+    description = " ".join(random.choices(WORDS, k=12))
+    now = datetime.utcnow()
+    return {
+        "title": title,
+        "description": description,
+        "priority": random.choice(("High", "Medium", "Low")),
+        "status": random.choice(("Pending", "In Progress", "Completed")),
+        "created_by": owner,
+        "assigned_to": assignee,
+        "comments": [],
+        "comment_count": 0,
+        "created_at": now,
+        "updated_at": now,
+        **search_fields(title, description),
+    }
+
+async def seed(db, users: int, tasks: int, activities: int) -> None:
+    from app.core.security import get_password_hash
+    from app.db.indexes import ensure_indexes
+
+    marker = {"users": users, "tasks": tasks, "activities": activities}
+    existing = await db["_loadtest"].find_one({"_id": "scale"})
+    if existing and {key: existing.get(key) for key in marker} == marker:
+        print(f"Reusing seeded {DATABASE_NAME} ({tasks} tasks)")
+        return
+
+    await db.client.drop_database(db.name)
+    password_hash = get_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    user_docs = [
+        {"email": f"user{i}@loadtest.example.com", "password_hash": password_hash,
+         # create_task needs the manager role
+         "roles": ["manager"], "created_at": now, "updated_at": now}
+        for i in range(users)
+    ]
+    user_ids = (await db["users"].insert_many(user_docs)).inserted_ids
+
+    started = time.perf_counter()
+    task_ids = []
+    for start in range(0, tasks, SEED_BATCH):
+        batch = [make_seed_task(n, user_ids) for n in range(start, min(start + SEED_BATCH, tasks))]
+        result = await db["tasks"].insert_many(batch, ordered=False)
+        # Keep a sample for activities; holding 10M ids is not needed
+        if len(task_ids) < activities * 20:
+            task_ids.extend(result.inserted_ids)
+        print(f"\rseeded {start + len(batch)}/{tasks} tasks", end="", flush=True)
+    print(f" in {time.perf_counter() - started:.1f}s")
+
+    managers = user_ids[::10]
+    if activities:
+        await db["activities"].insert_many([
+            {"activity_name": f"activity {i}", "description": None,
+             "tasks": task_ids[i * 20 % max(len(task_ids), 1):][:20],
+             "manager_id": managers[i % len(managers)], "created_at": now, "updated_at": now}
+            for i in range(activities)
+        ])
+    await ensure_indexes(db)
+    await db["_loadtest"].replace_one({"_id": "scale"}, marker, upsert=True)
+
+# ---------------------------------------------------------------- workload
+
+class Session:
+    def __init__(self, client: httpx.AsyncClient, email: str):
+        self.client = client
+        self.email = email
+        self.headers = {}
+        self.user_id = None
+        self.task_ids = []
+
+    async def login(self):
+        response = await self.client.post(
+            "/auth/login", data={"username": self.email, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def list(self):
+        response = await self.client.get("/tasks/", params={"limit": 20, "view": "summary"}, headers=self.headers)
+        if response.status_code == 200 and response.json():
+            self.task_ids = [task["_id"] for task in response.json()]
+        return response
+
+    async def search(self):
+        return await self.client.get(
+            "/tasks/", params={"search": random.choice(WORDS), "limit": 20, "view": "summary"}, headers=self.headers
+        )
+
+    async def get(self):
+        if not self.task_ids:
+            return await self.list()
+        return await self.client.get(f"/tasks/{random.choice(self.task_ids)}", headers=self.headers)
+
+    async def create(self):
+        response = await self.client.post("/tasks/", headers=self.headers, json={
+            "title": f"{random.choice(WORDS)} {random.choice(WORDS)}",
+            "description": " ".join(random.choices(WORDS, k=8)),
+            "priority": random.choice(("High", "Medium", "Low")),
+        })
+        if response.status_code == 201:
+            self.task_ids.append(response.json()["_id"])
+        return response
+
+    async def comment(self):
+        if not self.task_ids:
+            return await self.create()
+        return await self.client.post(
+            f"/tasks/{random.choice(self.task_ids)}/comments",
+            headers=self.headers, json={"user_id": self.user_id, "content": "load test comment"},
+        )
+
+    async def update(self):
+        if not self.task_ids:
+            return await self.create()
+        return await self.client.put(
+            f"/tasks/{random.choice(self.task_ids)}", headers=self.headers,
+            json={"status": random.choice(("Pending", "In Progress", "Completed"))},
+        )
+
+OPERATIONS = ("login", "list", "search", "get", "create", "comment", "update")
+
+async def virtual_user(client, email, weights, deadline, remaining, samples):
+    session = Session(client, email)
+    await session.login()
+    me = await client.get("/users/me", headers=session.headers)
+    session.user_id = me.json()["_id"] if me.status_code == 200 else None
+    names = list(weights)
+    weight_values = list(weights.values())
+    while time.perf_counter() < deadline and remaining[0] > 0:
+        remaining[0] -= 1
+        name = random.choices(names, weights=weight_values)[0]
+        started = time.perf_counter()
+        try:
+            response = await getattr(session, name)()
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        samples[name].append((time.perf_counter() - started, ok))
+
+async def run_workload(client, args, weights) -> dict:
+    samples = {name: [] for name in weights}
+    remaining = [args.requests]
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*[
+        virtual_user(client, f"user{i % args.users}@loadtest.example.com", weights, deadline, remaining, samples)
+        for i in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+    results = {}
+    for name, entries in samples.items():
+        durations = sorted(duration for duration, _ in entries)
+        results[name] = {
+            "count": len(entries),
+            "errors": sum(1 for _, ok in entries if not ok),
+            "p50_ms": round(percentile(durations, 0.50) * 1e3, 3),
+            "p95_ms": round(percentile(durations, 0.95) * 1e3, 3),
+            "p99_ms": round(percentile(durations, 0.99) * 1e3, 3),
+            "rps": round(len(entries) / elapsed, 1),
+        }
+    total = sum(result["count"] for result in results.values())
+    results["_total"] = {"count": total, "rps": round(total / elapsed, 1), "elapsed_s": round(elapsed, 2)}
+    return results
+
+# ---------------------------------------------------------------- targets
+
+async def run_asgi(args, weights) -> dict:
+    from app.core.config import settings
+
+    settings.DATABASE_NAME = DATABASE_NAME
+    settings.MONGODB_URI = args.mongodb_uri
+    # Every virtual user shares one client IP
+    settings.RATE_LIMIT_ENABLED = False
+    from app.main import app
+
+    # ASGITransport sends no lifespan events; run startup and shutdown (Mongo
+    # connection, audit consumer, warm-up, drain) as uvicorn would
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            return await run_workload(client, args, weights)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def run_uvicorn(args, weights) -> dict:
+    port = free_port()
+    env = {
+        **os.environ, "DATABASE_NAME": DATABASE_NAME, "MONGODB_URI": args.mongodb_uri,
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=Path(__file__).parent.parent, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise SystemExit("uvicorn did not start")
+            return await run_workload(client, args, weights)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+# ---------------------------------------------------------------- reporting
+
+def print_report(results: dict) -> None:
+    print(f"\n{'endpoint':<10} {'count':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+    for name, result in results.items():
+        if name.startswith("_"):
+            continue
+        print(f"{name:<10} {result['count']:>8} {result['errors']:>7} {result['p50_ms']:>9.2f} "
+              f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['rps']:>9.1f}")
+    total = results["_total"]
+    print(f"{'total':<10} {total['count']:>8} {'':>7} {'':>9} {'':>9} {'':>9} {total['rps']:>9.1f}")
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if name.startswith("_") or not before or not result["count"]:
+            continue
+        if before["p95_ms"] and result["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f}ms -> {result['p95_ms']:.2f}ms")
+        if before["rps"] and result["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{name}: req/s {before['rps']:.1f} -> {result['rps']:.1f}")
+    return regressions
+
+def baseline_path(args) -> Path:
+    if args.baseline:
+        return Path(args.baseline)
+    return BASELINE_DIR / f"{args.mode}-{args.tasks}.json"
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mongodb-uri", default=os.environ.get("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--activities", type=int, default=1_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=10**9, help="stop after this many requests")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (--mode uvicorn)")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--baseline", help="baseline file (default: baselines/<mode>-<tasks>.json)")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    weights = parse_mix(args.mix)
+    client = AsyncIOMotorClient(args.mongodb_uri)
+    await seed(client[DATABASE_NAME], args.users, args.tasks, args.activities)
+    client.close()
+
+    results = await (run_asgi if args.mode == "asgi" else run_uvicorn)(args, weights)
+    print_report(results)
+
+    path = baseline_path(args)
+    if args.compare:
+        if not path.exists():
+            print(f"No baseline at {path}")
+            return 1
+        regressions = compare(results, json.loads(path.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {path}")
+    if args.save_baseline:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "meta": {
+                "mode": args.mode, "users": args.users, "tasks": args.tasks,
+                "concurrency": args.concurrency, "mix": args.mix, "workers": args.workers,
+                "python": platform.python_version(), "recorded_at": datetime.utcnow().isoformat(),
+            },
+            "results": results,
+        }, indent=2))
+        print(f"Saved baseline to {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))